@@ -1,27 +1,96 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, render_template, request, jsonify, send_from_directory, Response
 import os
 import json
 from datetime import datetime, timedelta
+from functools import wraps
 import numpy as np
 from werkzeug.utils import secure_filename
 from model.predictor import AdherencePredictor
 from utils.prescription_reader import PrescriptionReader
 from utils.data_generator import generate_sample_data
-from utils.drug_interaction_checker import DrugInteractionChecker
+from utils.drug_interaction_checker import DrugInteractionChecker, InteractionSessionStore
 from utils.medicine_db import MedicineDatabase
+from utils.name_resolver import DrugNameResolver
 from utils.ocr_processor import PrescriptionOCR
+from utils.hot_reload import HotReloader
+from utils.micro_batch import MicroBatcher, QueueFull
+from utils.background_jobs import BackgroundJobs, JobAlreadyRunning
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['ALLOWED_EXTENSIONS'] = {'png', 'jpg', 'jpeg', 'pdf'}
 
-# Initialize ML model and utilities
-predictor = AdherencePredictor()
+# Initialize ML model and utilities. Heavy components load in background
+# threads so the server accepts traffic (and answers /livez) right away.
+# PREDICTION_SCORE_TABLE=1 answers predictions from a precomputed score table
+use_score_table = os.environ.get('PREDICTION_SCORE_TABLE') == '1'
+# Reloaded whenever a training run (in this or another process) publishes a new model version
+predictor = HotReloader(
+    'predictor', lambda: AdherencePredictor(use_score_table=use_score_table), ['model/CURRENT'],
+    validate=lambda candidate: candidate.model is not None, background=True
+)
+predictor.watch(interval=int(os.environ.get('MODEL_WATCH_INTERVAL', 10)))
+# Concurrent /api/predict calls are scored together in one predict_batch call
+prediction_batcher = MicroBatcher(
+    'predict', lambda patients: predictor.predict_batch(patients),
+    max_batch_size=int(os.environ.get('PREDICT_BATCH_SIZE', 32)),
+    max_wait_ms=float(os.environ.get('PREDICT_BATCH_WAIT_MS', 2)),
+    max_queue_depth=int(os.environ.get('PREDICT_QUEUE_DEPTH', 1000))
+)
 prescription_reader = PrescriptionReader()
-drug_checker = DrugInteractionChecker()
-medicine_db = MedicineDatabase()
-ocr_processor = PrescriptionOCR()
+ocr_processor = HotReloader('ocr', PrescriptionOCR, [], background=True)
+
+def build_drug_checker():
+    checker = DrugInteractionChecker()
+    if medicine_db.ready:
+        checker.name_resolver = DrugNameResolver(medicine_db.current, checker)
+    return checker
+
+def rebuild_drug_checker(database):
+    # Brand name aliases depend on the medicine dataset. Waiting also outlasts
+    # an interactions rebuild that started against the previous medicines.
+    drug_checker.reload(trigger='medicines reload', wait=True)
+
+# Dataset-backed components are rebuilt in the background and swapped in
+# atomically when their source files change or /api/admin/reload is called
+medicine_db = HotReloader(
+    'medicines', MedicineDatabase, ['use_dataset/medicine_dataset.csv'],
+    validate=lambda database: len(database.medicines_db) > 0,
+    on_swap=rebuild_drug_checker, background=True
+)
+drug_checker = HotReloader(
+    'interactions', build_drug_checker,
+    ['use_dataset/db_drug_interactions.csv', 'use_dataset/drug_aliases.csv'],
+    validate=lambda checker: len(checker.drug1_ids) > 0,
+    requires=[medicine_db], background=True
+)
+interaction_sessions = InteractionSessionStore(drug_checker)
+
+def run_training(job):
+    """Train a new model version off the request thread and swap it in"""
+    # Generate sample data if not exists
+    if not os.path.exists('data/training_data.csv'):
+        job.update('generating sample data', 0.0)
+        generate_sample_data()
+    
+    # Train a separate instance; the live one keeps serving until the swap
+    trainer = AdherencePredictor(load=False)
+    metrics = trainer.train_model(
+        'data/training_data.csv', progress=job.update,
+        n_jobs=int(os.environ.get('TRAIN_JOBS', -1)),
+        boosting=os.environ.get('TRAIN_BOOSTING', 'gradient'),
+        chunksize=int(os.environ.get('TRAIN_CHUNKSIZE', 0)) or None,
+        sample_size=int(os.environ.get('TRAIN_SAMPLE_SIZE', 200000))
+    )
+    predictor.reload(trigger='training', wait=True)
+    return {'metrics': metrics, 'version': trainer.version}
+
+training_jobs = BackgroundJobs('training', run_training)
+reloadable_components = {'medicines': medicine_db, 'interactions': drug_checker}
+for component in reloadable_components.values():
+    component.watch(interval=int(os.environ.get('DATASET_WATCH_INTERVAL', 30)))
+components = {'predictor': predictor, 'ocr': ocr_processor, **reloadable_components}
 
 # Ensure directories exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -31,6 +100,24 @@ os.makedirs('static/charts', exist_ok=True)
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+def requires_components(*names):
+    """Answer 503 while a component the route needs is still loading"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            loading = [name for name in names if not components[name].ready]
+            if loading:
+                response = jsonify({
+                    'success': False,
+                    'error': f"Not ready yet: {', '.join(loading)}",
+                    'loading': loading
+                })
+                response.headers['Retry-After'] = '5'
+                return response, 503
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
 def calculate_medicine_impact(medicines, interaction_checker):
     """
     Calculate the impact of selected medicines on adherence prediction
@@ -58,8 +145,10 @@ def calculate_medicine_impact(medicines, interaction_checker):
         confidence_adjustment -= 2
         factors.append(f"Moderate polypharmacy ({medicine_count} medicines)")
     
-    # 2. Check for drug interactions
-    if medicine_count >= 2:
+    # 2. Check for drug interactions (skipped while the database is loading)
+    if medicine_count >= 2 and interaction_checker is None:
+        factors.append("Drug interactions not checked (interaction database still loading)")
+    elif medicine_count >= 2:
         # Extract medicine names - handle both string and dict formats
         medicine_names = []
         for med in medicines:
@@ -110,22 +199,26 @@ def calculate_medicine_impact(medicines, interaction_checker):
         else:
             medicine_name = str(medicine).lower()
         
+        # Match indicators against the generic names too, so brands are recognized
+        generic_names = interaction_checker.resolve_generic_names(medicine_name) if interaction_checker else ()
+        searchable_name = ' '.join((medicine_name,) + generic_names)
+        
         # Medicines with complex dosing (examples)
         complex_indicators = ['insulin', 'warfarin', 'methotrexate', 'levothyroxine', 'prednisone']
-        if any(indicator in medicine_name for indicator in complex_indicators):
+        if any(indicator in searchable_name for indicator in complex_indicators):
             complex_medicines += 1
             score_adjustment -= 3
             factors.append(f"{medicine_name.title()} requires careful dosing")
         
         # Medicines with known adherence issues
         low_adherence_indicators = ['antibiotic', 'antidepressant', 'statin', 'blood pressure']
-        if any(indicator in medicine_name for indicator in low_adherence_indicators):
+        if any(indicator in searchable_name for indicator in low_adherence_indicators):
             score_adjustment -= 2
             factors.append(f"{medicine_name.title()} type has lower adherence rates")
         
         # Medicines with typically good adherence
         high_adherence_indicators = ['vitamin', 'supplement', 'aspirin']
-        if any(indicator in medicine_name for indicator in high_adherence_indicators):
+        if any(indicator in searchable_name for indicator in high_adherence_indicators):
             high_adherence_medicines += 1
             score_adjustment += 1
     
@@ -172,77 +265,112 @@ def patients_page():
 def analytics_page():
     return render_template('analytics.html')
 
+def parse_patient(data):
+    """Read the model inputs of one patient from a request body"""
+    return {
+        'age': int(data.get('age', 0)),
+        'gender': data.get('gender', 'Other'),
+        'medication_count': int(data.get('medication_count', 1)),
+        'dosage_frequency': int(data.get('dosage_frequency', 1)),
+        'reminder_enabled': 1 if data.get('reminder_enabled') else 0,
+        'missed_doses_last_month': int(data.get('missed_doses_last_month', 0)),
+        'comorbidities': int(data.get('comorbidities', 0)),
+        'side_effects': 1 if data.get('side_effects') else 0,
+        'cost_concern': int(data.get('cost_concern', 1))
+    }
+
+def build_prediction_response(prediction, medicines):
+    """
+    Shape a model prediction for the API, adjusted for the selected medicines
+    
+    Args:
+        prediction (dict): Result of predictor.predict or predict_batch
+        medicines (list): Medicines the patient takes, may be empty
+        
+    Returns:
+        dict: Prediction fields returned by /api/predict
+    """
+    if not medicines:
+        return {
+            'adherence_score': round(prediction['adherence_score'], 2),
+            'risk_level': prediction['risk_level'],
+            'recommendations': prediction['recommendations'],
+            'confidence': round(prediction['confidence'], 2)
+        }
+    
+    # Apply medicine-specific adjustments
+    medicine_adjustment = calculate_medicine_impact(medicines, drug_checker if drug_checker.ready else None)
+    adjusted_score = prediction['adherence_score'] + medicine_adjustment['score_adjustment']
+    adjusted_score = max(0, min(100, adjusted_score))  # Clamp to 0-100
+    
+    # Recalculate risk level based on adjusted score
+    if adjusted_score >= 80:
+        risk_level = 'Low'
+    elif adjusted_score >= 60:
+        risk_level = 'Medium'
+    else:
+        risk_level = 'High'
+    
+    # Adjust confidence based on medicine factors
+    confidence = prediction['confidence'] + medicine_adjustment['confidence_adjustment']
+    confidence = max(50, min(98, confidence))  # Clamp to 50-98
+    
+    # Add medicine-specific recommendations
+    all_recommendations = prediction['recommendations'] + medicine_adjustment['recommendations']
+    
+    return {
+        'adherence_score': round(adjusted_score, 2),
+        'risk_level': risk_level,
+        'recommendations': all_recommendations,
+        'confidence': round(confidence, 2),
+        'medicine_factors': medicine_adjustment['factors']
+    }
+
 @app.route('/api/predict', methods=['POST'])
+@requires_components('predictor')
 def predict_adherence():
     try:
         data = request.json
         
-        # Extract features
-        age = int(data.get('age', 0))
-        gender = data.get('gender', 'Other')
-        medication_count = int(data.get('medication_count', 1))
-        dosage_frequency = int(data.get('dosage_frequency', 1))
-        reminder_enabled = 1 if data.get('reminder_enabled') else 0
-        missed_doses_last_month = int(data.get('missed_doses_last_month', 0))
-        comorbidities = int(data.get('comorbidities', 0))
-        side_effects = 1 if data.get('side_effects') else 0
-        cost_concern = int(data.get('cost_concern', 1))
-        medicines = data.get('medicines', [])
+        # Make base prediction, batched with concurrent requests
+        prediction = prediction_batcher.submit(parse_patient(data))
         
-        # Make base prediction
-        prediction = predictor.predict({
-            'age': age,
-            'gender': gender,
-            'medication_count': medication_count,
-            'dosage_frequency': dosage_frequency,
-            'reminder_enabled': reminder_enabled,
-            'missed_doses_last_month': missed_doses_last_month,
-            'comorbidities': comorbidities,
-            'side_effects': side_effects,
-            'cost_concern': cost_concern
-        })
+        return jsonify({'success': True, **build_prediction_response(prediction, data.get('medicines', []))})
         
-        # Apply medicine-specific adjustments
-        if medicines:
-            medicine_adjustment = calculate_medicine_impact(medicines, drug_checker)
-            adjusted_score = prediction['adherence_score'] + medicine_adjustment['score_adjustment']
-            adjusted_score = max(0, min(100, adjusted_score))  # Clamp to 0-100
-            
-            # Recalculate risk level based on adjusted score
-            if adjusted_score >= 80:
-                risk_level = 'Low'
-            elif adjusted_score >= 60:
-                risk_level = 'Medium'
-            else:
-                risk_level = 'High'
-            
-            # Adjust confidence based on medicine factors
-            confidence = prediction['confidence'] + medicine_adjustment['confidence_adjustment']
-            confidence = max(50, min(98, confidence))  # Clamp to 50-98
-            
-            # Add medicine-specific recommendations
-            all_recommendations = prediction['recommendations'] + medicine_adjustment['recommendations']
-            
-            return jsonify({
-                'success': True,
-                'adherence_score': round(adjusted_score, 2),
-                'risk_level': risk_level,
-                'recommendations': all_recommendations,
-                'confidence': round(confidence, 2),
-                'medicine_factors': medicine_adjustment['factors']
-            })
+    except QueueFull as e:
+        response = jsonify({'success': False, 'error': str(e)})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/predict/batch', methods=['POST'])
+@requires_components('predictor')
+def predict_adherence_batch():
+    """Predict adherence for many patients with one model call"""
+    try:
+        data = request.json
+        patients = data.get('patients', [])
+        
+        predictions = predictor.predict_batch([parse_patient(patient) for patient in patients])
+        results = [
+            build_prediction_response(prediction, patient.get('medicines', []))
+            for patient, prediction in zip(patients, predictions)
+        ]
         
         return jsonify({
             'success': True,
-            'adherence_score': round(prediction['adherence_score'], 2),
-            'risk_level': prediction['risk_level'],
-            'recommendations': prediction['recommendations'],
-            'confidence': round(prediction['confidence'], 2)
+            'predictions': results,
+            'count': len(results)
         })
-        
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/predict/metrics', methods=['GET'])
+def predict_metrics():
+    """Get batching settings, queue depth and batch size statistics for /api/predict"""
+    return jsonify({'success': True, 'batching': prediction_batcher.stats()})
+
 @app.route('/api/upload_prescription', methods=['POST'])
 def upload_prescription():
     try:
@@ -376,23 +504,48 @@ def manage_reminders():
 
 @app.route('/api/train_model', methods=['POST'])
 def train_model():
+    """Start a background training job"""
     try:
-        # Generate sample data if not exists
-        if not os.path.exists('data/training_data.csv'):
-            generate_sample_data()
-        
-        # Train the model
-        metrics = predictor.train_model('data/training_data.csv')
+        job = training_jobs.start()
         
         return jsonify({
             'success': True,
-            'metrics': metrics,
-            'message': 'Model trained successfully'
-        })
+            'job': job,
+            'message': 'Model training started'
+        }), 202
+    except JobAlreadyRunning as e:
+        return jsonify({'success': False, 'error': str(e), 'job': e.job}), 409
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/train_model/jobs', methods=['GET'])
+def list_training_jobs():
+    """Get recent training jobs, newest first"""
+    return jsonify({
+        'success': True,
+        'jobs': training_jobs.list(),
+        'model_version': predictor.version if predictor.ready else None
+    })
+
+@app.route('/api/train_model/jobs/<job_id>', methods=['GET'])
+def get_training_job(job_id):
+    """Get the status, progress and result of a training job"""
+    job = training_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/api/train_model/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_training_job(job_id):
+    """Stop a training job at its next stage; a cancelled job publishes nothing"""
+    if training_jobs.get(job_id) is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+    
+    cancelled = training_jobs.cancel(job_id)
+    return jsonify({'success': cancelled, 'job': training_jobs.get(job_id)}), 202 if cancelled else 409
+
 @app.route('/api/search_medicine', methods=['GET'])
+@requires_components('medicines')
 def search_medicine():
     """Search for medicines by name"""
     try:
@@ -413,6 +566,7 @@ def search_medicine():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route('/api/medicine_info/<medicine_name>', methods=['GET'])
+@requires_components('medicines')
 def get_medicine_info(medicine_name):
     """Get detailed information about a medicine"""
     try:
@@ -432,6 +586,7 @@ def get_medicine_info(medicine_name):
         return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route('/api/check_interactions', methods=['POST'])
+@requires_components('interactions')
 def check_drug_interactions():
     """Check for drug-drug interactions"""
     try:
@@ -459,7 +614,105 @@ def check_drug_interactions():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/check_interactions/session', methods=['POST'])
+@requires_components('interactions')
+def check_drug_interactions_session():
+    """Incrementally check interactions while a regimen is being edited"""
+    try:
+        data = request.json
+        
+        try:
+            token, medications, summary = interaction_sessions.update(
+                token=data.get('token'),
+                medications=data.get('medications'),
+                add=data.get('add', []),
+                remove=data.get('remove', [])
+            )
+        except KeyError:
+            return jsonify({
+                'success': False,
+                'error': 'Session expired, resend the full medication list'
+            }), 410
+        
+        return jsonify({
+            'success': True,
+            'token': token,
+            'medications': medications,
+            'summary': summary
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/check_interactions/bulk', methods=['POST'])
+@requires_components('interactions')
+def check_drug_interactions_bulk():
+    """Check many regimens at once, streaming one JSON summary per line"""
+    try:
+        data = request.json
+        regimens = data.get('regimens', [])
+        
+        # Regimens are plain medication lists or {"id": ..., "medications": [...]}
+        ids = []
+        medication_lists = []
+        for index, regimen in enumerate(regimens):
+            if isinstance(regimen, dict):
+                ids.append(regimen.get('id', index))
+                medications = regimen.get('medications', [])
+            else:
+                ids.append(index)
+                medications = regimen
+            # A malformed regimen (None here) gets an error line, the rest are still checked
+            medication_lists.append([str(med) for med in medications] if isinstance(medications, list) else None)
+        
+        summaries = drug_checker.check_regimens([meds for meds in medication_lists if meds is not None])
+        
+        def generate():
+            # Runs while streaming, after the route has returned: errors become
+            # error lines. After a failure the rest are checked one at a time,
+            # so a bad regimen only fails its own line.
+            batched = summaries
+            for regimen_id, medications in zip(ids, medication_lists):
+                try:
+                    if medications is None:
+                        raise ValueError('Regimen must be a list of medication names')
+                    summary = None
+                    if batched is not None:
+                        try:
+                            summary = next(batched)
+                        except Exception:
+                            batched = None
+                    if batched is None:
+                        summary = next(drug_checker.check_regimens([medications]))
+                    line = json.dumps({'id': regimen_id, 'summary': summary})
+                except Exception as e:
+                    line = json.dumps({'id': regimen_id, 'error': str(e)})
+                yield line + '\n'
+        
+        return Response(generate(), mimetype='application/x-ndjson')
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/drug_interactions/<drug_name>', methods=['GET'])
+@requires_components('interactions')
+def get_drug_interactions(drug_name):
+    """Get a page of all known interactions for one drug"""
+    try:
+        severity = request.args.get('severity', '')
+        severity = [level.strip().lower() for level in severity.split(',') if level.strip()]
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', 50))
+        
+        neighborhood = drug_checker.get_neighborhood(drug_name, severity, offset, limit)
+        
+        return jsonify({
+            'success': True,
+            'neighborhood': neighborhood
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
 @app.route('/api/medicine_batch', methods=['POST'])
+@requires_components('medicines')
 def get_medicine_batch():
     """Get information for multiple medicines"""
     try:
@@ -477,6 +730,7 @@ def get_medicine_batch():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 @app.route('/api/medicine_stats', methods=['GET'])
+@requires_components('medicines')
 def get_medicine_stats():
     """Get database statistics"""
     try:
@@ -489,7 +743,103 @@ def get_medicine_stats():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
+@app.route('/api/medicines_by_class/<therapeutic_class>', methods=['GET'])
+@requires_components('medicines')
+def get_medicines_by_class(therapeutic_class):
+    """Get medicines whose therapeutic class matches a pattern"""
+    try:
+        limit = int(request.args.get('limit', 20))
+        
+        results = medicine_db.get_medicines_by_therapeutic_class(therapeutic_class, limit)
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'count': len(results)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/medicines_by_side_effect', methods=['GET'])
+@requires_components('medicines')
+def get_medicines_by_side_effect():
+    """Get a page of medicines listing one or more side effects"""
+    try:
+        terms = request.args.get('terms', '').split(',')
+        match = request.args.get('match', 'any')
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', 50))
+        
+        results = medicine_db.find_by_side_effects(terms, match, offset, limit)
+        
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/api/medicines_by_use', methods=['GET'])
+@requires_components('medicines')
+def get_medicines_by_use():
+    """Get a page of medicines listing one or more uses"""
+    try:
+        terms = request.args.get('terms', '').split(',')
+        match = request.args.get('match', 'any')
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', 50))
+        
+        results = medicine_db.find_by_uses(terms, match, offset, limit)
+        
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/livez', methods=['GET'])
+def livez():
+    """Liveness probe: the process is up and serving requests"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness probe: every component has finished loading"""
+    ready = all(component.ready for component in components.values())
+    return jsonify({
+        'ready': ready,
+        'components': {name: component.status() for name, component in components.items()}
+    }), 200 if ready else 503
+
+@app.route('/api/admin/reload', methods=['GET', 'POST'])
+def reload_datasets():
+    """Rebuild dataset indexes in the background, or report reload status"""
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            component = data.get('component', 'all')
+            if component != 'all' and component not in reloadable_components:
+                return jsonify({'success': False, 'error': f'Unknown component: {component}'}), 400
+            
+            names = list(reloadable_components) if component == 'all' else [component]
+            started = {name: reloadable_components[name].reload(trigger='admin') for name in names}
+            
+            return jsonify({
+                'success': True,
+                'started': started,
+                'status': [reloadable_components[name].status() for name in names]
+            }), 202
+        
+        return jsonify({
+            'success': True,
+            'status': [component.status() for component in reloadable_components.values()]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
 @app.route('/api/ocr/extract', methods=['POST'])
+@requires_components('ocr')
 def extract_prescription_text():
     """Extract text from prescription image using OCR"""
     try:
@@ -528,6 +878,7 @@ if __name__ == '__main__':
         print("Generating sample training data...")
         generate_sample_data()
         print("Training initial model...")
+        predictor.wait_ready()
         predictor.train_model('data/training_data.csv')
     
     app.run(debug=True, host='0.0.0.0', port=5000)
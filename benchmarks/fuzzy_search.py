@@ -0,0 +1,117 @@
+"""
+Benchmark fuzzy medicine name search
+Compares difflib.get_close_matches over the full names list with the trigram
+index used by MedicineDatabase, for growing list sizes
+
+Usage:
+    python -m benchmarks.fuzzy_search
+    python -m benchmarks.fuzzy_search --sizes 10000 250000 --queries 50
+    python -m benchmarks.fuzzy_search --dataset use_dataset/medicine_dataset.csv
+"""
+
+import argparse
+import random
+import time
+import pandas as pd
+from difflib import get_close_matches
+from utils.fuzzy_index import TrigramIndex
+
+SYLLABLES = ['am', 'ox', 'ci', 'lin', 'par', 'ace', 'ta', 'mol', 'az', 'ith', 'ro', 'my',
+             'cin', 'met', 'for', 'min', 'pan', 'to', 'pra', 'zole', 'dol', 'o', 'xy', 'ce']
+STRENGTHS = ['5mg', '10mg', '50mg', '100mg', '250mg', '500mg', '650mg', '1gm', '']
+FORMS = ['tablet', 'capsule', 'syrup', 'injection', 'cream', 'drops', 'suspension']
+
+def synthetic_names(count, seed=0):
+    """
+    Generate medicine-like names ("paracetamol 500mg tablet")
+    
+    Args:
+        count (int): Number of names
+        seed (int): Random seed
+        
+    Returns:
+        list: Lowercase unique names
+    """
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        stem = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+        names.add(' '.join(part for part in [stem, rng.choice(STRENGTHS), rng.choice(FORMS)] if part))
+    return sorted(names, key=lambda name: rng.random())
+
+def misspell(name, rng):
+    """Turn a name into a typical autocomplete query: a typo'd, truncated name"""
+    query = name[:rng.randint(max(4, len(name) // 2), len(name))]
+    chars = list(query)
+    for _ in range(rng.randint(1, 2)):
+        position = rng.randrange(len(chars))
+        action = rng.choice(['replace', 'delete', 'insert'])
+        if action == 'replace':
+            chars[position] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+        elif action == 'delete' and len(chars) > 3:
+            del chars[position]
+        else:
+            chars.insert(position, rng.choice('abcdefghijklmnopqrstuvwxyz'))
+    return ''.join(chars)
+
+def run(names, queries, limit=10, cutoff=0.6):
+    """
+    Time both implementations on the same queries and compare their results
+    
+    Returns:
+        dict: Build time, per-query latencies and agreement with difflib
+    """
+    start = time.perf_counter()
+    index = TrigramIndex(names)
+    build_seconds = time.perf_counter() - start
+    
+    difflib_seconds = indexed_seconds = 0.0
+    found = expected = identical = 0
+    for query in queries:
+        start = time.perf_counter()
+        reference = get_close_matches(query, names, n=limit, cutoff=cutoff)
+        difflib_seconds += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        result = index.get_close_matches(query, n=limit, cutoff=cutoff)
+        indexed_seconds += time.perf_counter() - start
+        
+        expected += len(reference)
+        found += len(set(reference) & set(result))
+        identical += result == reference
+    
+    return {
+        'names': len(names),
+        'build_seconds': build_seconds,
+        'difflib_ms': difflib_seconds / len(queries) * 1000,
+        'indexed_ms': indexed_seconds / len(queries) * 1000,
+        'recall': found / expected if expected else 1.0,
+        'identical': identical / len(queries)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000, 250000])
+    parser.add_argument('--queries', type=int, default=30, help='queries per size')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--dataset', help='medicine CSV to sample names from instead of synthetic ones')
+    args = parser.parse_args()
+    
+    if args.dataset:
+        all_names = pd.read_csv(args.dataset, usecols=['name'])['name'].dropna().str.lower()
+        all_names = list(dict.fromkeys(all_names))
+    else:
+        all_names = synthetic_names(max(args.sizes))
+    
+    rng = random.Random(1)
+    print(f"{'names':>8} {'build s':>8} {'difflib ms':>11} {'index ms':>9} {'speedup':>8} {'recall':>7} {'same list':>10}")
+    for size in args.sizes:
+        names = all_names[:size]
+        queries = [misspell(rng.choice(names), rng) for _ in range(args.queries)]
+        report = run(names, queries, limit=args.limit)
+        print(f"{report['names']:>8} {report['build_seconds']:>8.2f} {report['difflib_ms']:>11.1f} "
+              f"{report['indexed_ms']:>9.2f} {report['difflib_ms'] / report['indexed_ms']:>7.0f}x "
+              f"{report['recall']:>7.1%} {report['identical']:>10.1%}")
+
+if __name__ == '__main__':
+    main()
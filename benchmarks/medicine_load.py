@@ -0,0 +1,77 @@
+"""
+Benchmark medicine dataset startup
+Measures load time and peak memory of MedicineDatabase when it parses the CSV
+(first run, which also writes the snapshot) and when it maps the snapshot,
+next to the previous chunked read_csv + concat loader. Each path runs in a
+fresh interpreter so peak memory is not shared between them.
+
+Usage:
+    python -m benchmarks.medicine_load
+    python -m benchmarks.medicine_load --dataset use_dataset/medicine_dataset.csv
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+def measure(mode, dataset, snapshot_path):
+    """
+    Load the dataset one way and report time and memory
+    
+    Args:
+        mode (str): 'chunked', 'csv' or 'snapshot'
+        dataset (str): Medicine CSV path
+        snapshot_path (str): Snapshot file to write or read
+        
+    Returns:
+        dict: Seconds taken and peak resident memory growth in MB
+    """
+    import pandas as pd
+    from utils.medicine_db import MedicineDatabase
+    
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == 'chunked':
+        chunks = []
+        for chunk in pd.read_csv(dataset, chunksize=10000, low_memory=False):
+            chunks.append(chunk)
+        rows = len(pd.concat(chunks, ignore_index=True))
+    else:
+        rows = len(MedicineDatabase(dataset, snapshot_path=snapshot_path).medicines_db)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    
+    # ru_maxrss is in kilobytes on Linux
+    return {'rows': rows, 'seconds': seconds, 'peak_mb': peak / 1024}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dataset', default='use_dataset/medicine_dataset.csv')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'SNAPSHOT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(measure(args.child[0], args.dataset, args.child[1])))
+        return
+    
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, 'medicine_dataset.snapshot')
+        print(f"{'loader':<38} {'rows':>8} {'seconds':>8} {'peak MB':>8}")
+        for mode, label in [('chunked', 'previous read_csv + concat, no indexes'),
+                            ('csv', 'CSV, writes snapshot (first run)'),
+                            ('snapshot', 'snapshot (later runs)')]:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.medicine_load', '--dataset', args.dataset,
+                 '--child', mode, snapshot_path],
+                capture_output=True, text=True, check=True
+            ).stdout
+            report = json.loads(output.strip().splitlines()[-1])
+            print(f"{label:<38} {report['rows']:>8} {report['seconds']:>8.2f} {report['peak_mb']:>8.1f}")
+
+if __name__ == '__main__':
+    main()
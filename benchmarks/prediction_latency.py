@@ -0,0 +1,105 @@
+"""
+Benchmark single-patient adherence prediction
+Checks that the flattened tree ensemble predicts the same scores as the
+trained model's own predict, then compares per-request latency of the two and
+of the full AdherencePredictor.predict call. Run from the project root after
+the model has been trained (python app.py trains it on first start).
+
+Usage:
+    python -m benchmarks.prediction_latency
+    python -m benchmarks.prediction_latency --requests 2000 --parity-rows 20000
+"""
+
+import argparse
+import random
+import time
+import numpy as np
+from model.predictor import AdherencePredictor
+
+def random_patient(rng):
+    """A patient with field ranges like the generated training data"""
+    return {
+        'age': rng.randint(18, 85),
+        'gender': rng.choice(['Male', 'Female', 'Other']),
+        'medication_count': rng.randint(1, 8),
+        'dosage_frequency': rng.randint(1, 5),
+        'reminder_enabled': rng.choice([0, 1]),
+        'missed_doses_last_month': rng.randint(0, 15),
+        'comorbidities': rng.randint(0, 5),
+        'side_effects': rng.choice([0, 1]),
+        'cost_concern': rng.randint(1, 6)
+    }
+
+def check_parity(predictor, patients):
+    """
+    Compare the flattened ensemble with model.predict
+    
+    Rows are taken both as prepared for predict and after the training scaler,
+    so splits across the whole training range are exercised.
+    
+    Returns:
+        tuple: (share of identical predictions, largest absolute difference)
+    """
+    features = predictor.prepare_features_batch(patients)
+    rows = np.vstack([features, (features - predictor.scaler.mean_) / predictor.scaler.scale_])
+    expected = predictor.model.predict(rows)
+    actual = predictor.flat_model.predict(rows)
+    return float(np.mean(expected == actual)), float(np.max(np.abs(expected - actual)))
+
+def time_calls(function, inputs):
+    """
+    Time one call per input
+    
+    Returns:
+        dict: Mean, median and 99th percentile latency in milliseconds
+    """
+    latencies = []
+    for value in inputs:
+        start = time.perf_counter()
+        function(value)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    return {
+        'mean_ms': latencies.mean(),
+        'p50_ms': np.percentile(latencies, 50),
+        'p99_ms': np.percentile(latencies, 99)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500, help='single-row calls timed per path')
+    parser.add_argument('--parity-rows', type=int, default=10000)
+    args = parser.parse_args()
+    
+    predictor = AdherencePredictor()
+    if predictor.model is None:
+        raise SystemExit('No trained model found under model/; train it first')
+    if predictor.flat_model is None:
+        raise SystemExit('The trained model could not be flattened')
+    
+    rng = random.Random(0)
+    identical, difference = check_parity(predictor, [random_patient(rng) for _ in range(args.parity_rows)])
+    print(f"Parity over {2 * args.parity_rows} rows: {identical:.1%} identical, max abs difference {difference:.3g}")
+    if difference > 1e-9:
+        raise SystemExit('Flattened ensemble does not match model.predict')
+    
+    patients = [random_patient(rng) for _ in range(args.requests)]
+    features = [predictor.prepare_features(patient) for patient in patients]
+    flat_model = predictor.flat_model
+    results = [
+        ('model.predict', time_calls(predictor.model.predict, features)),
+        ('flattened predict', time_calls(flat_model.predict, features)),
+        ('AdherencePredictor.predict', time_calls(predictor.predict, patients))
+    ]
+    predictor.flat_model = None
+    results.append(('  ... unflattened', time_calls(predictor.predict, patients)))
+    predictor.flat_model = flat_model
+    
+    print(f"Node arrays: {flat_model.memory_usage() / 1024 / 1024:.1f} MB, "
+          f"{len(flat_model.roots)} trees, depth {flat_model.depth}")
+    print(f"{'path':<28} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, report in results:
+        print(f"{name:<28} {report['mean_ms']:>8.3f} {report['p50_ms']:>8.3f} {report['p99_ms']:>8.3f}")
+
+if __name__ == '__main__':
+    main()
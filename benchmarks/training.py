@@ -0,0 +1,72 @@
+"""
+Benchmark adherence model training
+Trains the ensemble with classic and histogram-based gradient boosting on
+growing samples of generated training data, reporting wall time and R² (test
+split and 5-fold cross-validation) for each. Models are written to a
+temporary directory, never to model/.
+
+Usage:
+    python -m benchmarks.training
+    python -m benchmarks.training --sizes 10000 100000 --jobs 4
+    python -m benchmarks.training --boosting histogram --no-share
+    python -m benchmarks.training --sizes 1000000 --chunksize 100000 --sample-size 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from model.model_store import ModelStore
+from model.predictor import AdherencePredictor
+from utils.data_generator import generate_sample_data
+
+def train(data_path, store_dir, boosting, n_jobs, share_data, chunksize=None, sample_size=200000):
+    """
+    Train one model and time it
+    
+    Returns:
+        dict: Wall time and the model's R² scores
+    """
+    trainer = AdherencePredictor(load=False)
+    trainer.store = ModelStore(store_dir)
+    start = time.perf_counter()
+    metrics = trainer.train_model(data_path, n_jobs=n_jobs, share_data=share_data, boosting=boosting,
+                                  chunksize=chunksize, sample_size=sample_size)
+    return {
+        'seconds': time.perf_counter() - start,
+        'r2_score': metrics['r2_score'],
+        'cv_r2_mean': metrics['cv_r2_mean']
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--boosting', nargs='+', choices=['gradient', 'histogram'], default=['gradient', 'histogram'])
+    parser.add_argument('--jobs', type=int, default=-1, help='worker processes for the fits')
+    parser.add_argument('--no-share', action='store_true', help='send each fit its own copy of the data')
+    parser.add_argument('--chunksize', type=int, help='stream the CSV this many rows at a time')
+    parser.add_argument('--sample-size', type=int, default=200000, help='training rows sampled when streaming')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Generate the largest sample once; smaller sizes are its first rows
+        print(f"Generating {max(args.sizes)} training rows...")
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            data = generate_sample_data(max(args.sizes))
+        finally:
+            os.chdir(cwd)
+        
+        print(f"{'rows':>9} {'boosting':>10} {'seconds':>9} {'test R2':>8} {'CV R2':>7}")
+        for size in args.sizes:
+            data_path = os.path.join(tmp, f'train_{size}.csv')
+            data.head(size).to_csv(data_path, index=False)
+            for boosting in args.boosting:
+                report = train(data_path, os.path.join(tmp, 'model'), boosting, args.jobs, not args.no_share,
+                               args.chunksize, args.sample_size)
+                print(f"{size:>9} {boosting:>10} {report['seconds']:>9.1f} "
+                      f"{report['r2_score']:>8.4f} {report['cv_r2_mean']:>7.4f}")
+
+if __name__ == '__main__':
+    main()
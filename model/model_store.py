@@ -0,0 +1,144 @@
+"""
+Versioned storage for trained model files
+Each training run writes its files to a new version directory; a pointer file
+names the live version and is replaced atomically, so readers always load a
+complete, consistent set of files
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime
+import joblib
+
+class ModelStore:
+    """
+    Model versions under <root>/versions, published through <root>/CURRENT
+    
+    Without a pointer file (models saved before versioning) the files are
+    read from the root directory itself.
+    
+    Published versions are never modified. Files derived from a version after
+    it is published go to its directory under <root>/cache instead, which is
+    pruned along with the version.
+    """
+    
+    POINTER = 'CURRENT'
+    
+    def __init__(self, root='model', keep_versions=5):
+        """
+        Args:
+            root (str): Directory holding the pointer and the versions
+            keep_versions (int): Published versions kept on disk, including the live one
+        """
+        self.root = root
+        self.keep_versions = keep_versions
+        self.versions_dir = os.path.join(root, 'versions')
+        self.cache_dir = os.path.join(root, 'cache')
+        self.pointer_path = os.path.join(root, self.POINTER)
+    
+    def current_version(self):
+        """
+        Get the published version
+        
+        Returns:
+            str: Version name, or None if no version has been published
+        """
+        try:
+            with open(self.pointer_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def version_dir(self, version):
+        """Directory of a version, or the root directory for version None"""
+        return os.path.join(self.versions_dir, version) if version else self.root
+    
+    def cache_path(self, version, name):
+        """
+        Path of a file derived from a version, outside the version directory
+        
+        Args:
+            version (str): Version name, or None for models saved before versioning
+            name (str): File name
+            
+        Returns:
+            str: The file path
+        """
+        directory = os.path.join(self.cache_dir, version) if version else self.root
+        return os.path.join(directory, name)
+    
+    def save(self, artifacts):
+        """
+        Write a new version and publish it
+        
+        Files are written to a staging directory that is renamed into place
+        once complete, then the pointer is swapped to the new version.
+        
+        Args:
+            artifacts (dict): File name to object, each written with joblib
+            
+        Returns:
+            str: The new version name
+        """
+        version = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        staging = os.path.join(self.versions_dir, f'.staging-{version}')
+        os.makedirs(staging)
+        try:
+            for name, value in artifacts.items():
+                joblib.dump(value, os.path.join(staging, name))
+            os.rename(staging, self.version_dir(version))
+        finally:
+            if os.path.exists(staging):
+                shutil.rmtree(staging)
+        
+        self.publish(version)
+        self.prune()
+        return version
+    
+    def publish(self, version):
+        """
+        Make a version live with a single atomic pointer replace
+        
+        Args:
+            version (str): Existing version name
+        """
+        if not os.path.isdir(self.version_dir(version)):
+            raise ValueError(f"Unknown model version: {version}")
+        
+        # A unique temporary file per call: threads of one process may publish at once
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f'{self.POINTER}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(version)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.pointer_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def versions(self):
+        """
+        List published versions
+        
+        Returns:
+            list: Version names, oldest first
+        """
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(name for name in os.listdir(self.versions_dir) if not name.startswith('.'))
+    
+    def prune(self):
+        """Remove the oldest versions beyond keep_versions, never the live one, and their caches"""
+        current = self.current_version()
+        stale = [version for version in self.versions() if version != current]
+        for version in stale[:max(0, len(stale) - (self.keep_versions - 1))]:
+            shutil.rmtree(self.version_dir(version), ignore_errors=True)
+        
+        if os.path.isdir(self.cache_dir):
+            kept = set(self.versions())
+            for version in os.listdir(self.cache_dir):
+                if version not in kept:
+                    shutil.rmtree(os.path.join(self.cache_dir, version), ignore_errors=True)
@@ -1,11 +1,41 @@
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, VotingRegressor
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.base import clone
+from sklearn.ensemble import (RandomForestRegressor, GradientBoostingRegressor,
+                              HistGradientBoostingRegressor, VotingRegressor)
+from sklearn.model_selection import train_test_split, KFold
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, mean_squared_error, r2_score
 import joblib
+from joblib import Parallel, delayed, effective_n_jobs, parallel_config
 import os
+import time
+from model.tree_ensemble import FlatTreeEnsemble
+from model.model_store import ModelStore
+from utils.binary_snapshot import source_signature, write_snapshot, read_snapshot
+
+def _fit_and_score(estimator, X, y, train=None, test=None):
+    """
+    Fit a fresh copy of an estimator on some rows and score it on others
+    
+    Module-level so it can run in a worker process. X and y are the full
+    training arrays, shared between tasks; each task only slices its rows.
+    
+    Args:
+        estimator: Unfitted estimator to clone
+        X (np.ndarray): Scaled training features
+        y (np.ndarray): Training targets
+        train (np.ndarray): Rows to fit on, or None for every row
+        test (np.ndarray): Rows to score with R², or None to skip scoring
+        
+    Returns:
+        tuple: (fitted estimator, R² on the test rows or None)
+    """
+    estimator = clone(estimator)
+    if train is None:
+        return estimator.fit(X, y), None
+    estimator.fit(X[train], y[train])
+    return estimator, r2_score(y[test], estimator.predict(X[test]))
 
 class AdherencePredictor:
     """
@@ -18,115 +48,213 @@ class AdherencePredictor:
     The ensemble combines predictions from both models using weighted averaging,
     providing more robust and accurate predictions than single models.
     """
-    def __init__(self):
+    # Patient fields used as model features, besides gender
+    PATIENT_FIELDS = ['age', 'medication_count', 'dosage_frequency', 'reminder_enabled',
+                      'missed_doses_last_month', 'comorbidities', 'side_effects', 'cost_concern']
+    GENDER_CODES = {'Male': 0, 'Female': 1, 'Other': 2}
+    
+    # Inputs covered by the optional score table: (field, lowest, highest), all integers
+    SCORE_GRID = [('age', 18, 85), ('gender_code', 0, 2), ('medication_count', 1, 7),
+                  ('dosage_frequency', 1, 4), ('reminder_enabled', 0, 1),
+                  ('missed_doses_last_month', 0, 14), ('comorbidities', 0, 4),
+                  ('side_effects', 0, 1), ('cost_concern', 1, 5)]
+    SCORE_TABLE_VERSION = 1
+    
+    # Above this many rows sklearn's own predict is faster than the flattened trees
+    FLAT_MODEL_MAX_ROWS = 128
+    
+    # (risk level, color) by score band: >= 80, >= 60, below
+    RISK_LEVELS = [('Low', 'success'), ('Medium', 'warning'), ('High', 'danger')]
+    
+    RECOMMENDATIONS = {
+        'reminders': {
+            'title': 'Enable Medication Reminders',
+            'description': 'Set up daily reminders to improve adherence by 20-30%',
+            'priority': 'high'
+        },
+        'follow_up': {
+            'title': 'Schedule Follow-up Consultation',
+            'description': 'Frequent missed doses detected. Consult with healthcare provider.',
+            'priority': 'high'
+        },
+        'medication_review': {
+            'title': 'Medication Review',
+            'description': 'Consider simplifying medication regimen with your doctor',
+            'priority': 'medium'
+        },
+        'side_effects': {
+            'title': 'Discuss Side Effects',
+            'description': 'Report side effects to your doctor for possible alternatives',
+            'priority': 'high'
+        },
+        'financial': {
+            'title': 'Financial Assistance',
+            'description': 'Explore generic alternatives or patient assistance programs',
+            'priority': 'medium'
+        },
+        'dosage_schedule': {
+            'title': 'Simplify Dosage Schedule',
+            'description': 'Ask about extended-release formulations for fewer daily doses',
+            'priority': 'medium'
+        },
+        'support_program': {
+            'title': 'Adherence Support Program',
+            'description': 'Enroll in a medication adherence support program',
+            'priority': 'high'
+        }
+    }
+    
+    def __init__(self, use_score_table=False, load=True):
+        """
+        Args:
+            use_score_table (bool): Precompute model scores for every input in
+                SCORE_GRID and answer predictions from that table
+            load (bool): Load the published model; False starts untrained, e.g. for a training run
+        """
         self.model = None
+        self.flat_model = None
+        self.use_score_table = use_score_table
+        self.score_table = None
         self.rf_model = None
         self.gb_model = None
         self.scaler = StandardScaler()
         self.label_encoder = LabelEncoder()
-        self.model_path = 'model/adherence_model.pkl'
-        self.scaler_path = 'model/scaler.pkl'
-        self.encoder_path = 'model/encoder.pkl'
+        self.store = ModelStore('model')
+        self._use_version(self.store.current_version())
         self.feature_importance = None
         self.feature_names = None
         self.uses_gender_dummies = False
         
+        self._index_features()
+        
         # Load model if exists
-        if os.path.exists(self.model_path):
+        if load and os.path.exists(self.model_path):
             self.load_model()
     
+    def _use_version(self, version):
+        """Point the model file paths at one model version"""
+        self.version = version
+        directory = self.model_dir = self.store.version_dir(version)
+        self.model_path = os.path.join(directory, 'adherence_model.pkl')
+        self.scaler_path = os.path.join(directory, 'scaler.pkl')
+        self.encoder_path = os.path.join(directory, 'encoder.pkl')
+        self.metadata_path = os.path.join(directory, 'metadata.pkl')
+        # Built after publishing, so kept out of the immutable version directory
+        self.score_table_path = self.store.cache_path(version, 'score_table.snapshot')
+    
+    def _index_features(self):
+        """
+        Precompute where each patient field lands in a feature row
+        
+        Called whenever the feature layout can change (init, load, train), so
+        prepare_features only writes values into place.
+        """
+        if self.uses_gender_dummies:
+            # Gender dummies matching training data; without saved names, the training column order
+            names = self.feature_names or self.PATIENT_FIELDS + [f'gender_{code}' for code in self.GENDER_CODES.values()]
+            self._gender_positions = {
+                code: names.index(f'gender_{code}')
+                for code in self.GENDER_CODES.values() if f'gender_{code}' in names
+            }
+            known = set(self.PATIENT_FIELDS) | {f'gender_{code}' for code in self.GENDER_CODES.values()}
+        else:
+            # age / 100, gender code, then the remaining fields
+            names = ['age_scaled', 'gender_code'] + self.PATIENT_FIELDS[1:]
+            self._gender_positions = {}
+            known = set(names)
+        
+        self._feature_count = len(names)
+        self._field_positions = [(name, i) for i, name in enumerate(names) if name in self.PATIENT_FIELDS]
+        self._unknown_features = [name for name in names if name not in known]
+    
     def prepare_features(self, data):
         """Prepare features for prediction"""
+        if self._unknown_features:
+            raise KeyError(f"No patient field for model features: {self._unknown_features}")
+        
+        features = np.zeros((1, self._feature_count))
+        row = features[0]
+        for field, position in self._field_positions:
+            row[position] = data[field]
+        
+        # Map gender to encoding used in training data
+        gender_code = self.GENDER_CODES.get(data['gender'], 2)
         if self.uses_gender_dummies:
-            # Use gender dummies matching training data
-            # Map gender to encoding used in training data
-            gender_map = {'Male': 0, 'Female': 1, 'Other': 2}
-            gender_code = gender_map.get(data['gender'], 2)
-            
-            features = {
-                'age': data['age'],
-                'medication_count': data['medication_count'],
-                'dosage_frequency': data['dosage_frequency'],
-                'reminder_enabled': data['reminder_enabled'],
-                'missed_doses_last_month': data['missed_doses_last_month'],
-                'comorbidities': data['comorbidities'],
-                'side_effects': data['side_effects'],
-                'cost_concern': data['cost_concern'],
-                'gender_0': 1 if gender_code == 0 else 0,
-                'gender_1': 1 if gender_code == 1 else 0,
-                'gender_2': 1 if gender_code == 2 else 0
-            }
-            # Create dataframe with correct column order
-            import pandas as pd
-            df = pd.DataFrame([features])
-            # Reorder columns to match training
-            if self.feature_names:
-                df = df[self.feature_names]
-            return df.values
+            position = self._gender_positions.get(gender_code)
+            if position is not None:
+                row[position] = 1
         else:
-            # Simple feature array
-            features = []
-            
-            # Age normalization
-            features.append(data['age'] / 100.0)
-            
-            # Gender encoding
-            gender_map = {'Male': 0, 'Female': 1, 'Other': 2}
-            features.append(gender_map.get(data['gender'], 2))
-            
-            # Medication count
-            features.append(data['medication_count'])
-            
-            # Dosage frequency
-            features.append(data['dosage_frequency'])
-            
-            # Reminder enabled
-            features.append(data['reminder_enabled'])
-            
-            # Missed doses
-            features.append(data['missed_doses_last_month'])
-            
-            # Comorbidities
-            features.append(data['comorbidities'])
-            
-            # Side effects
-            features.append(data['side_effects'])
-            
-            # Cost concern
-            features.append(data['cost_concern'])
-            
-            return np.array(features).reshape(1, -1)
+            row[0] = data['age'] / 100.0
+            row[1] = gender_code
+        
+        return features
     
-    def train_model(self, data_path):
+    def train_model(self, data_path, progress=None, n_jobs=-1, share_data=True, boosting='gradient',
+                    chunksize=None, sample_size=200000):
         """
         Train the ensemble adherence prediction model
         
         Uses Voting Regressor with:
         1. Random Forest Regressor - Handles non-linear relationships
         2. Gradient Boosting Regressor - Sequential error correction
-        """
-        # Load data
-        df = pd.read_csv(data_path)
         
-        # Prepare features
-        X = df.drop(['adherence_score', 'adherent'], axis=1)
-        y = df['adherence_score']
-        
-        # Handle categorical variables
-        if 'gender' in X.columns:
-            gender_dummies = pd.get_dummies(X['gender'], prefix='gender')
-            X = pd.concat([X.drop('gender', axis=1), gender_dummies], axis=1)
-            self.uses_gender_dummies = True
-            self.feature_names = X.columns.tolist()
-        
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
-        
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        The final fit and the five cross-validation fits are independent, so
+        they run together in a process pool.
+        
+        With chunksize set, the CSV is streamed instead of loaded whole: the
+        scaler is fitted incrementally on every training row, and the trees
+        are fitted and evaluated on bounded random samples of the rows, so
+        memory use no longer grows with the file size.
+        
+        Args:
+            data_path (str): Training data CSV
+            progress (callable): Called with (stage, fraction done) before each
+                stage; raising from it stops training before the model is saved
+            n_jobs (int): Worker processes for the fits, -1 for one per CPU
+            share_data (bool): Memory-map the scaled training arrays into the
+                workers once, instead of sending each fit its own copy
+            boosting (str): 'gradient' for GradientBoostingRegressor, or
+                'histogram' for HistGradientBoostingRegressor, much faster on large datasets
+            chunksize (int): Rows read at a time to stream the CSV, or None to load it whole
+            sample_size (int): When streaming, most training rows the trees are
+                fitted on; a quarter as many hold-out rows are kept for evaluation
+        """
+        if boosting not in ('gradient', 'histogram'):
+            raise ValueError(f"Unknown boosting: {boosting}")
+        report = progress or (lambda stage, fraction: None)
+        
+        if chunksize:
+            report('streaming data', 0.0)
+            X_train_scaled, y_train_values, X_test_scaled, y_test, columns, rows = self._stream_training_data(
+                data_path, chunksize, sample_size, lambda stage, fraction: report(stage, 0.3 * fraction)
+            )
+        else:
+            # Load data
+            report('loading data', 0.0)
+            df = pd.read_csv(data_path)
+            
+            # Prepare features
+            X = df.drop(['adherence_score', 'adherent'], axis=1)
+            y = df['adherence_score']
+            
+            # Handle categorical variables
+            if 'gender' in X.columns:
+                gender_dummies = pd.get_dummies(X['gender'], prefix='gender')
+                X = pd.concat([X.drop('gender', axis=1), gender_dummies], axis=1)
+                self.uses_gender_dummies = True
+                self.feature_names = X.columns.tolist()
+            self._index_features()
+            columns = X.columns.tolist()
+            
+            # Split data
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, random_state=42
+            )
+            
+            # Scale features
+            X_train_scaled = self.scaler.fit_transform(X_train)
+            X_test_scaled = self.scaler.transform(X_test)
+            y_train_values = y_train.to_numpy()
         
         # Initialize individual models
         self.rf_model = RandomForestRegressor(
@@ -136,18 +264,31 @@ class AdherencePredictor:
             min_samples_leaf=2,
             max_features='sqrt',
             random_state=42,
-            n_jobs=-1
+            # Each pool worker gets one core; a nested pool per worker would oversubscribe
+            n_jobs=1 if effective_n_jobs(n_jobs) > 1 else -1
         )
         
-        self.gb_model = GradientBoostingRegressor(
-            n_estimators=200,
-            learning_rate=0.1,
-            max_depth=5,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            subsample=0.8,
-            random_state=42
-        )
+        if boosting == 'histogram':
+            # Bins features once instead of sorting them at every split
+            self.gb_model = HistGradientBoostingRegressor(
+                max_iter=200,
+                learning_rate=0.1,
+                max_depth=5,
+                max_leaf_nodes=None,
+                min_samples_leaf=20,
+                early_stopping=False,
+                random_state=42
+            )
+        else:
+            self.gb_model = GradientBoostingRegressor(
+                n_estimators=200,
+                learning_rate=0.1,
+                max_depth=5,
+                min_samples_split=5,
+                min_samples_leaf=2,
+                subsample=0.8,
+                random_state=42
+            )
         
         # Create ensemble model
         self.model = VotingRegressor(
@@ -158,14 +299,25 @@ class AdherencePredictor:
             weights=[1, 1]  # Equal weighting
         )
         
-        # Train ensemble
-        self.model.fit(X_train_scaled, y_train)
+        # Train ensemble and cross-validate (same folds as cross_val_score(cv=5))
+        report('fitting ensemble and cross-validating', 0.3 if chunksize else 0.05)
+        folds = [(None, None)] + list(KFold(n_splits=5).split(X_train_scaled))
+        with parallel_config(max_nbytes='1M' if share_data else None):
+            fits = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_and_score)(self.model, X_train_scaled, y_train_values, train, test)
+                for train, test in folds
+            )
+        self.model = fits[0][0]
+        cv_scores = np.array([score for _, score in fits[1:]])
+        self._export_model()
+        self.score_table = None
         
         # Calculate feature importance from Random Forest (access fitted estimator)
         rf_estimator = self.model.named_estimators_['rf']
-        self.feature_importance = dict(zip(X.columns, rf_estimator.feature_importances_))
+        self.feature_importance = dict(zip(columns, rf_estimator.feature_importances_))
         
         # Evaluate
+        report('evaluating', 0.9)
         y_pred = self.model.predict(X_test_scaled)
         
         # Clip predictions to valid range
@@ -174,10 +326,6 @@ class AdherencePredictor:
         mse = mean_squared_error(y_test, y_pred)
         r2 = r2_score(y_test, y_pred)
         
-        # Perform cross-validation
-        cv_scores = cross_val_score(self.model, X_train_scaled, y_train, 
-                                     cv=5, scoring='r2')
-        
         # Calculate classification metrics
         y_test_binary = (y_test >= 70).astype(int)
         y_pred_binary = (y_pred >= 70).astype(int)
@@ -188,10 +336,13 @@ class AdherencePredictor:
         f1 = f1_score(y_test_binary, y_pred_binary, zero_division=0)
         
         # Save model
+        report('saving', 0.95)
         self.save_model()
+        if self.use_score_table:
+            self._prepare_score_table()
         
-        return {
-            'algorithm': 'Ensemble (Random Forest + Gradient Boosting)',
+        metrics = {
+            'algorithm': f"Ensemble (Random Forest + {'Histogram ' if boosting == 'histogram' else ''}Gradient Boosting)",
             'mse': round(mse, 2),
             'r2_score': round(r2, 4),
             'cv_r2_mean': round(cv_scores.mean(), 4),
@@ -202,6 +353,107 @@ class AdherencePredictor:
             'f1_score': round(f1, 4),
             'feature_importance': self.feature_importance
         }
+        if chunksize:
+            metrics['streaming'] = {
+                'rows_read': rows,
+                'training_sample_rows': len(y_train_values),
+                'evaluation_sample_rows': len(y_test)
+            }
+        return metrics
+    
+    def _stream_training_data(self, data_path, chunksize, sample_size, report):
+        """
+        Read training data chunk by chunk, keeping only bounded samples
+        
+        Each row is held out for evaluation with probability 0.2. The scaler is
+        fitted incrementally on every training row, while uniform random
+        samples of at most sample_size training rows and sample_size // 4
+        hold-out rows are kept for the trees (reservoir sampling by random
+        keys). Features follow the in-memory layout: fields in file order,
+        then one dummy per gender code.
+        
+        Args:
+            data_path (str): Training data CSV
+            chunksize (int): Rows read at a time
+            sample_size (int): Most training rows kept
+            report (callable): Called with (stage, fraction of the file read)
+            
+        Returns:
+            tuple: (scaled training sample, its targets, scaled hold-out sample,
+                its targets, feature names, rows read)
+        """
+        rng = np.random.default_rng(42)
+        limits = {'train': max(sample_size, 1), 'test': max(sample_size // 4, 1)}
+        samples = {'train': None, 'test': None}
+        file_size = max(os.path.getsize(data_path), 1)
+        self.scaler = StandardScaler()
+        columns = None
+        rows = 0
+        
+        with open(data_path, 'rb') as f:
+            for chunk in pd.read_csv(f, chunksize=chunksize):
+                if columns is None:
+                    fields = [name for name in chunk.columns if name not in ('adherence_score', 'adherent', 'gender')]
+                    codes = sorted(self.GENDER_CODES.values()) if 'gender' in chunk.columns else []
+                    columns = fields + [f'gender_{code}' for code in codes]
+                
+                X = np.empty((len(chunk), len(columns)))
+                X[:, :len(fields)] = chunk[fields].to_numpy(dtype=float)
+                if codes:
+                    X[:, len(fields):] = chunk['gender'].to_numpy()[:, None] == codes
+                y = chunk['adherence_score'].to_numpy(dtype=float)
+                rows += len(chunk)
+                
+                held_out = rng.random(len(chunk)) < 0.2
+                if not held_out.all():
+                    self.scaler.partial_fit(X[~held_out])
+                for part, mask in (('train', ~held_out), ('test', held_out)):
+                    samples[part] = self._keep_sample(samples[part], X[mask], y[mask],
+                                                      rng.random(mask.sum()), limits[part])
+                
+                # Buffered position, close enough for progress
+                report(f'streaming data ({rows} rows read)', f.tell() / file_size)
+        
+        if samples['train'] is None or samples['test'] is None:
+            raise ValueError(f"Not enough rows to train on in {data_path}")
+        
+        if codes:
+            self.uses_gender_dummies = True
+            self.feature_names = columns
+        self._index_features()
+        
+        X_train, y_train, _ = samples['train']
+        X_test, y_test, _ = samples['test']
+        return self.scaler.transform(X_train), y_train, self.scaler.transform(X_test), y_test, columns, rows
+    
+    @staticmethod
+    def _keep_sample(sample, X, y, keys, size):
+        """
+        Merge new rows into a uniform random sample of at most size rows
+        
+        Every row gets a random key and the rows with the smallest keys are
+        kept, which is a uniform sample of all rows seen so far.
+        
+        Args:
+            sample (tuple): (X, y, keys) kept so far, or None
+            X (np.ndarray): New rows
+            y (np.ndarray): Their targets
+            keys (np.ndarray): Their random keys
+            size (int): Most rows to keep
+            
+        Returns:
+            tuple: (X, y, keys) of the kept rows, in the order they were read, or None if empty
+        """
+        if sample is not None:
+            X = np.concatenate([sample[0], X])
+            y = np.concatenate([sample[1], y])
+            keys = np.concatenate([sample[2], keys])
+        if len(keys) == 0:
+            return None
+        if len(keys) > size:
+            keep = np.sort(np.argpartition(keys, size)[:size])
+            X, y, keys = X[keep], y[keep], keys[keep]
+        return X, y, keys
     
     def predict(self, patient_data):
         """Predict adherence for a patient"""
@@ -209,11 +461,13 @@ class AdherencePredictor:
             # Use rule-based prediction if model not trained
             return self._rule_based_prediction(patient_data)
         
-        # Prepare features
-        features = self.prepare_features(patient_data)
-        
-        # Make prediction
-        adherence_score = self.model.predict(features)[0]
+        # Make prediction: a table lookup for inputs on the score grid, otherwise
+        # the model, without sklearn's per-estimator overhead when possible
+        index = self._grid_index(patient_data) if self.score_table is not None else None
+        if index is not None:
+            adherence_score = float(self.score_table[index])
+        else:
+            adherence_score = self._model_scores(self.prepare_features(patient_data))[0]
         adherence_score = np.clip(adherence_score, 0, 100)
         
         # Determine risk level
@@ -241,6 +495,125 @@ class AdherencePredictor:
             'confidence': float(confidence)
         }
     
+    def _patient_columns(self, patients):
+        """
+        Collect patient fields into one float array per field
+        
+        Args:
+            patients (list): Patient dicts as accepted by predict
+            
+        Returns:
+            dict: Field name to array, plus 'gender_code'
+        """
+        columns = {
+            field: np.array([patient[field] for patient in patients], dtype=np.float64)
+            for field in self.PATIENT_FIELDS
+        }
+        columns['gender_code'] = np.array(
+            [self.GENDER_CODES.get(patient['gender'], 2) for patient in patients], dtype=np.float64
+        )
+        return columns
+    
+    def _feature_matrix(self, columns):
+        """
+        Build the 2-D feature matrix for many patients, laid out as prepare_features does
+        
+        Args:
+            columns (dict): Patient field arrays from _patient_columns
+            
+        Returns:
+            np.ndarray: One row of features per patient
+        """
+        if self._unknown_features:
+            raise KeyError(f"No patient field for model features: {self._unknown_features}")
+        
+        features = np.zeros((len(columns['gender_code']), self._feature_count))
+        for field, position in self._field_positions:
+            features[:, position] = columns[field]
+        
+        if self.uses_gender_dummies:
+            for code, position in self._gender_positions.items():
+                features[:, position] = columns['gender_code'] == code
+        else:
+            features[:, 0] = columns['age'] / 100.0
+            features[:, 1] = columns['gender_code']
+        
+        return features
+    
+    def prepare_features_batch(self, patients):
+        """Prepare the feature matrix for many patients"""
+        return self._feature_matrix(self._patient_columns(patients))
+    
+    def predict_batch(self, patients):
+        """
+        Predict adherence for many patients with a single model call
+        
+        Args:
+            patients (list): Patient dicts as accepted by predict
+            
+        Returns:
+            list: Prediction dicts as returned by predict, in input order
+        """
+        if not patients:
+            return []
+        
+        columns = self._patient_columns(patients)
+        if self.model is None:
+            # Use rule-based prediction if model not trained
+            scores = self._rule_based_scores(columns)
+            confidences = np.full(len(patients), 75.0)
+        else:
+            indexes = self._grid_indexes(columns)
+            covered = indexes >= 0
+            scores = np.empty(len(patients))
+            if covered.any():
+                scores[covered] = self.score_table[indexes[covered]]
+            if not covered.all():
+                features = self._feature_matrix({field: values[~covered] for field, values in columns.items()})
+                scores[~covered] = self._model_scores(features)
+            scores = np.clip(scores, 0, 100)
+            confidences = np.minimum(95, 70 + (scores / 5))
+        
+        bands = np.where(scores >= 80, 0, np.where(scores >= 60, 1, 2))
+        recommendations = self._generate_recommendations_batch(columns, scores)
+        
+        predictions = []
+        for score, band, patient_recommendations, confidence in zip(
+                scores.tolist(), bands.tolist(), recommendations, confidences.tolist()):
+            risk_level, risk_color = self.RISK_LEVELS[band]
+            predictions.append({
+                'adherence_score': score,
+                'risk_level': risk_level,
+                'risk_color': risk_color,
+                'recommendations': patient_recommendations,
+                'confidence': confidence
+            })
+        return predictions
+    
+    def _rule_based_scores(self, columns):
+        """Vectorized _rule_based_prediction score, with the same steps in the same order"""
+        score = np.full(len(columns['age']), 100.0)
+        
+        # Age factor
+        score -= np.where(columns['age'] > 70, 10, np.where(columns['age'] < 30, 5, 0))
+        
+        # Medication complexity
+        score -= columns['medication_count'] * 3
+        score -= columns['dosage_frequency'] * 2
+        
+        # Missed doses impact
+        score -= columns['missed_doses_last_month'] * 5
+        
+        # Positive factors
+        score += np.where(columns['reminder_enabled'] != 0, 15, 0)
+        
+        # Negative factors
+        score -= columns['comorbidities'] * 5
+        score -= np.where(columns['side_effects'] != 0, 10, 0)
+        score -= columns['cost_concern'] * 5
+        
+        return np.clip(score, 0, 100)
+    
     def _rule_based_prediction(self, patient_data):
         """Rule-based prediction when ML model is not available"""
         score = 100.0
@@ -296,81 +669,234 @@ class AdherencePredictor:
         recommendations = []
         
         if not patient_data['reminder_enabled']:
-            recommendations.append({
-                'title': 'Enable Medication Reminders',
-                'description': 'Set up daily reminders to improve adherence by 20-30%',
-                'priority': 'high'
-            })
+            recommendations.append(dict(self.RECOMMENDATIONS['reminders']))
         
         if patient_data['missed_doses_last_month'] > 5:
-            recommendations.append({
-                'title': 'Schedule Follow-up Consultation',
-                'description': 'Frequent missed doses detected. Consult with healthcare provider.',
-                'priority': 'high'
-            })
+            recommendations.append(dict(self.RECOMMENDATIONS['follow_up']))
         
         if patient_data['medication_count'] > 5:
-            recommendations.append({
-                'title': 'Medication Review',
-                'description': 'Consider simplifying medication regimen with your doctor',
-                'priority': 'medium'
-            })
+            recommendations.append(dict(self.RECOMMENDATIONS['medication_review']))
         
         if patient_data['side_effects']:
-            recommendations.append({
-                'title': 'Discuss Side Effects',
-                'description': 'Report side effects to your doctor for possible alternatives',
-                'priority': 'high'
-            })
+            recommendations.append(dict(self.RECOMMENDATIONS['side_effects']))
         
         if patient_data['cost_concern'] > 3:
-            recommendations.append({
-                'title': 'Financial Assistance',
-                'description': 'Explore generic alternatives or patient assistance programs',
-                'priority': 'medium'
-            })
+            recommendations.append(dict(self.RECOMMENDATIONS['financial']))
         
         if patient_data['dosage_frequency'] > 3:
-            recommendations.append({
-                'title': 'Simplify Dosage Schedule',
-                'description': 'Ask about extended-release formulations for fewer daily doses',
-                'priority': 'medium'
-            })
+            recommendations.append(dict(self.RECOMMENDATIONS['dosage_schedule']))
         
         if adherence_score < 60:
-            recommendations.append({
-                'title': 'Adherence Support Program',
-                'description': 'Enroll in a medication adherence support program',
-                'priority': 'high'
-            })
+            recommendations.append(dict(self.RECOMMENDATIONS['support_program']))
         
         return recommendations
     
+    def _generate_recommendations_batch(self, columns, adherence_scores):
+        """
+        Generate recommendations for many patients at once
+        
+        Each rule of _generate_recommendations is evaluated once over the whole
+        batch; patients then receive the matching recommendations in rule order.
+        
+        Args:
+            columns (dict): Patient field arrays from _patient_columns
+            adherence_scores (np.ndarray): Score per patient
+            
+        Returns:
+            list: Recommendation list per patient
+        """
+        rules = [
+            ('reminders', columns['reminder_enabled'] == 0),
+            ('follow_up', columns['missed_doses_last_month'] > 5),
+            ('medication_review', columns['medication_count'] > 5),
+            ('side_effects', columns['side_effects'] != 0),
+            ('financial', columns['cost_concern'] > 3),
+            ('dosage_schedule', columns['dosage_frequency'] > 3),
+            ('support_program', adherence_scores < 60)
+        ]
+        
+        recommendations = [[] for _ in range(len(adherence_scores))]
+        for key, applies in rules:
+            recommendation = self.RECOMMENDATIONS[key]
+            for i in np.flatnonzero(applies).tolist():
+                recommendations[i].append(dict(recommendation))
+        
+        # Rules were applied rule by rule, so each list is already in rule order
+        return recommendations
+    
     def save_model(self):
-        """Save model to disk"""
-        os.makedirs('model', exist_ok=True)
+        """
+        Save model to disk as a new version and publish it
+        
+        Processes loading the model keep reading the previous version's
+        files; they pick up the new one once the pointer is swapped.
+        """
         if self.model is not None:
-            joblib.dump(self.model, self.model_path)
-            joblib.dump(self.scaler, self.scaler_path)
             # Save metadata
             metadata = {
                 'uses_gender_dummies': self.uses_gender_dummies,
                 'feature_names': self.feature_names,
                 'feature_importance': self.feature_importance
             }
-            joblib.dump(metadata, 'model/metadata.pkl')
+            self._use_version(self.store.save({
+                'adherence_model.pkl': self.model,
+                'scaler.pkl': self.scaler,
+                'metadata.pkl': metadata
+            }))
     
     def load_model(self):
-        """Load model from disk"""
+        """Load the published model version from disk"""
         try:
+            self._use_version(self.store.current_version())
             self.model = joblib.load(self.model_path)
             self.scaler = joblib.load(self.scaler_path)
             # Load metadata if exists
-            if os.path.exists('model/metadata.pkl'):
-                metadata = joblib.load('model/metadata.pkl')
+            if os.path.exists(self.metadata_path):
+                metadata = joblib.load(self.metadata_path)
                 self.uses_gender_dummies = metadata.get('uses_gender_dummies', False)
                 self.feature_names = metadata.get('feature_names', None)
                 self.feature_importance = metadata.get('feature_importance', None)
         except Exception as e:
             print(f"Error loading model: {e}")
             self.model = None
+        self._index_features()
+        self._export_model()
+        self.score_table = None
+        if self.use_score_table and self.model is not None:
+            self._prepare_score_table()
+    
+    def _export_model(self):
+        """Flatten the fitted ensemble for single-row predictions, if it is made of trees"""
+        self.flat_model = None
+        if self.model is None:
+            return
+        try:
+            self.flat_model = FlatTreeEnsemble.from_model(self.model)
+        except TypeError as e:
+            print(f"Warning: using the unflattened model for predictions: {e}")
+    
+    def _model_scores(self, features):
+        """Raw model scores; small batches skip sklearn's per-call overhead"""
+        if self.flat_model is not None and len(features) <= self.FLAT_MODEL_MAX_ROWS:
+            return self.flat_model.predict(features)
+        return self.model.predict(features)
+    
+    def _grid_index(self, patient_data):
+        """
+        Position of a patient in the score table
+        
+        Returns:
+            int: Table index, or None if an input is outside SCORE_GRID
+        """
+        index = 0
+        for field, low, high in self.SCORE_GRID:
+            if field == 'gender_code':
+                value = self.GENDER_CODES.get(patient_data['gender'], 2)
+            else:
+                value = patient_data[field]
+            if not low <= value <= high or value != int(value):
+                return None
+            index = index * (high - low + 1) + int(value) - low
+        return index
+    
+    def _grid_indexes(self, columns):
+        """Vectorized _grid_index over patient columns, with -1 for patients outside the grid"""
+        count = len(columns['gender_code'])
+        if self.score_table is None:
+            return np.full(count, -1, dtype=np.int64)
+        
+        index = np.zeros(count, dtype=np.int64)
+        inside = np.ones(count, dtype=bool)
+        for field, low, high in self.SCORE_GRID:
+            values = columns[field]
+            inside &= (values >= low) & (values <= high) & (values == np.floor(values))
+            index = index * (high - low + 1) + np.where(inside, values - low, 0).astype(np.int64)
+        return np.where(inside, index, -1)
+    
+    def _prepare_score_table(self):
+        """
+        Memory-map the score table for the current model, building it if needed
+        
+        The table file records the model file it was built from, so a retrained
+        or replaced model never answers from an old table. On failure the live
+        model keeps serving every prediction.
+        """
+        self.score_table = None
+        metadata = {
+            'version': self.SCORE_TABLE_VERSION,
+            'model': source_signature(self.model_path),
+            'grid': [list(axis) for axis in self.SCORE_GRID],
+            'feature_names': self.feature_names,
+            'uses_gender_dummies': self.uses_gender_dummies
+        }
+        
+        try:
+            if os.path.exists(self.score_table_path):
+                stored, arrays = read_snapshot(self.score_table_path)
+                if stored == metadata:
+                    self.score_table = arrays['scores']
+                    return
+            
+            start = time.perf_counter()
+            write_snapshot(self.score_table_path, {'scores': self._build_score_table()}, metadata)
+            self.score_table = read_snapshot(self.score_table_path)[1]['scores']
+            print(f"Built score table of {len(self.score_table)} inputs in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            print(f"Warning: score table unavailable, using the live model: {e}")
+            self.score_table = None
+    
+    def _build_score_table(self, chunk_size=20000):
+        """
+        Evaluate the model at every point of SCORE_GRID
+        
+        Values of one field that fall between the same split thresholds of
+        every tree give the same score, so only one value per such group is
+        evaluated and the result is expanded to the full grid.
+        
+        Returns:
+            np.ndarray: float32 scores in row-major SCORE_GRID order
+        """
+        representatives = []
+        expansions = []
+        for field, low, high in self.SCORE_GRID:
+            values = np.arange(low, high + 1, dtype=np.float64)
+            keys = self._split_keys(field, values)
+            _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+            representatives.append(values[first])
+            expansions.append(inverse.ravel())
+        
+        shape = [len(values) for values in representatives]
+        scores = np.empty(int(np.prod(shape)))
+        for start in range(0, len(scores), chunk_size):
+            stop = min(start + chunk_size, len(scores))
+            points = np.unravel_index(np.arange(start, stop), shape)
+            columns = {
+                field: representatives[axis][points[axis]]
+                for axis, (field, low, high) in enumerate(self.SCORE_GRID)
+            }
+            scores[start:stop] = self.model.predict(self._feature_matrix(columns))
+        
+        return scores.reshape(shape)[np.ix_(*expansions)].astype(np.float32).ravel()
+    
+    def _split_keys(self, field, values):
+        """
+        Describe how the model's splits see each value of one grid field
+        
+        Returns:
+            np.ndarray: One row per value; equal rows reach the same leaves
+        """
+        if self.flat_model is None:
+            return values[:, None]
+        
+        # Features for the values with every other field held fixed
+        columns = {name: np.full(len(values), low, dtype=np.float64) for name, low, high in self.SCORE_GRID}
+        columns[field] = values
+        features = self._feature_matrix(columns)
+        
+        # Number of thresholds below each value, per feature (trees go left on x <= threshold)
+        splits = np.isfinite(self.flat_model.threshold)
+        keys = np.empty(features.shape, dtype=np.int64)
+        for position in range(features.shape[1]):
+            thresholds = np.sort(self.flat_model.threshold[splits & (self.flat_model.feature == position)])
+            keys[:, position] = np.searchsorted(thresholds, features[:, position], side='left')
+        return keys
@@ -0,0 +1,256 @@
+"""
+Flattened tree ensemble for low-latency prediction
+Exports the fitted trees of a scikit-learn ensemble into contiguous node arrays
+and evaluates every tree at once, instead of going through the per-estimator
+dispatch and input validation of model.predict on each request
+"""
+
+import numpy as np
+from sklearn.ensemble import (RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor,
+                              HistGradientBoostingRegressor, VotingRegressor)
+from sklearn.tree import DecisionTreeRegressor
+
+def _float32_split_thresholds(threshold):
+    """
+    Convert thresholds of float32 splits to equivalent float64 ones
+    
+    sklearn's decision trees test float32(x) <= t. float32(x) <= t holds
+    exactly when float32(x) is at most f, the largest float32 not above t, so
+    x must round down to f or below: x is below the midpoint between f and the
+    next float32, or equal to it when ties round to f (f's last mantissa bit is
+    even). The midpoint is exact in float64.
+    
+    Args:
+        threshold (np.ndarray): float64 thresholds applied to float32 inputs
+        
+    Returns:
+        np.ndarray: Thresholds t' with x <= t' matching float32(x) <= t
+    """
+    below = threshold.astype(np.float32)
+    below = np.where(below.astype(np.float64) > threshold, np.nextafter(below, np.float32(-np.inf)), below)
+    above = np.nextafter(below, np.float32(np.inf))
+    midpoint = (below.astype(np.float64) + above.astype(np.float64)) / 2
+    ties_down = (below.view(np.int32) & 1) == 0
+    return np.where(ties_down, midpoint, np.nextafter(midpoint, -np.inf))
+
+def _sklearn_tree(tree, scale=1.0):
+    """
+    Node arrays of a fitted sklearn Tree
+    
+    Args:
+        tree: The tree_ attribute of a fitted decision tree
+        scale (float): Factor applied to leaf values (a boosting learning rate)
+        
+    Returns:
+        dict: Per-node arrays, children -1 for leaves, and the tree depth
+    """
+    if tree.n_outputs != 1:
+        raise TypeError('Only single-output regressors can be flattened')
+    
+    value = tree.value[:, 0, 0].astype(np.float64)
+    if scale != 1.0:
+        value = value * scale
+    if hasattr(tree, 'missing_go_to_left'):
+        missing_left = tree.missing_go_to_left.astype(bool)
+    else:
+        missing_left = np.zeros(tree.node_count, dtype=bool)
+    return {
+        'feature': tree.feature.astype(np.int64),
+        'threshold': _float32_split_thresholds(tree.threshold.astype(np.float64)),
+        'left': tree.children_left.astype(np.int64),
+        'right': tree.children_right.astype(np.int64),
+        'missing_left': missing_left,
+        'value': value,
+        'depth': int(tree.max_depth)
+    }
+
+def _histogram_tree(predictor):
+    """
+    Node arrays of one HistGradientBoostingRegressor tree
+    
+    These trees compare float64 inputs, so thresholds are used as they are.
+    
+    Args:
+        predictor: TreePredictor of a fitted histogram gradient boosting model
+        
+    Returns:
+        dict: Same layout as _sklearn_tree
+    """
+    nodes = predictor.nodes
+    if nodes['is_categorical'].any():
+        raise TypeError('Categorical splits cannot be flattened')
+    
+    leaf = nodes['is_leaf'].astype(bool)
+    return {
+        'feature': nodes['feature_idx'].astype(np.int64),
+        'threshold': nodes['num_threshold'].astype(np.float64),
+        'left': np.where(leaf, -1, nodes['left'].astype(np.int64)),
+        'right': np.where(leaf, -1, nodes['right'].astype(np.int64)),
+        'missing_left': nodes['missing_go_to_left'].astype(bool),
+        'value': nodes['value'].astype(np.float64),
+        'depth': int(nodes['depth'].max())
+    }
+
+class FlatTreeEnsemble:
+    """
+    All trees of a fitted regressor in one set of node arrays
+    
+    Nodes of every tree are concatenated; child indices point into the shared
+    arrays and leaves point to themselves, so a fixed number of steps (the
+    deepest tree's depth) walks every row down every tree in lockstep.
+    
+    The ensemble is a weighted average of members. Each member is a range of
+    trees whose leaf sum is averaged or offset: a forest averages its trees,
+    gradient boosting adds learning-rate scaled stages to its initial estimate.
+    """
+    
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots,
+                 depth, n_features, members):
+        """
+        Args:
+            feature (np.ndarray): Split feature of each node
+            threshold (np.ndarray): Split threshold of each node for float64 inputs (+inf for leaves)
+            left (np.ndarray): Left child of each node (itself for leaves)
+            right (np.ndarray): Right child of each node (itself for leaves)
+            missing_left (np.ndarray): Whether a NaN feature value goes left
+            value (np.ndarray): Leaf value of each node, already scaled by its member
+            roots (np.ndarray): Root node of each tree
+            depth (int): Depth of the deepest tree
+            n_features (int): Number of input features
+            members (list): (first tree, end tree, trees averaged, offset, weight) per member
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.n_features = n_features
+        self.members = members
+        self.weights = [member[4] for member in members]
+    
+    @classmethod
+    def from_model(cls, model):
+        """
+        Export a fitted regressor
+        
+        Supports VotingRegressor over forests, gradient boosting (classic or
+        histogram-based) and single decision trees, as well as those
+        estimators on their own.
+        
+        Args:
+            model: Fitted scikit-learn regressor
+            
+        Returns:
+            FlatTreeEnsemble: Evaluator with the same predictions as model.predict
+            
+        Raises:
+            TypeError: If the model contains an estimator that cannot be flattened
+        """
+        if isinstance(model, VotingRegressor):
+            weights = model.weights
+            if weights is None:
+                weights = [1] * len(model.estimators)
+            # estimators_ only holds the members that were not dropped
+            weights = [w for (name, est), w in zip(model.estimators, weights) if est != 'drop']
+            parts = list(zip(model.estimators_, weights))
+        else:
+            parts = [(model, 1)]
+        
+        trees = []
+        members = []
+        for estimator, weight in parts:
+            first = len(trees)
+            averaged, offset = 1, 0.0
+            if isinstance(estimator, (RandomForestRegressor, ExtraTreesRegressor)):
+                trees.extend(_sklearn_tree(tree.tree_) for tree in estimator.estimators_)
+                # The forest averages its trees
+                averaged = len(estimator.estimators_)
+            elif isinstance(estimator, GradientBoostingRegressor):
+                if estimator.loss not in ('squared_error', 'absolute_error', 'huber', 'quantile'):
+                    raise TypeError(f"Unsupported gradient boosting loss: {estimator.loss}")
+                trees.extend(_sklearn_tree(tree.tree_, estimator.learning_rate) for tree in estimator.estimators_[:, 0])
+                if estimator.init_ != 'zero':
+                    offset = float(estimator.init_.predict(np.zeros((1, estimator.n_features_in_)))[0])
+            elif isinstance(estimator, HistGradientBoostingRegressor):
+                if estimator.loss not in ('squared_error', 'absolute_error', 'quantile'):
+                    raise TypeError(f"Unsupported histogram gradient boosting loss: {estimator.loss}")
+                # Leaf values already include the learning rate
+                trees.extend(_histogram_tree(predictors[0]) for predictors in estimator._predictors)
+                offset = float(estimator._baseline_prediction[0, 0])
+            elif isinstance(estimator, DecisionTreeRegressor):
+                trees.append(_sklearn_tree(estimator.tree_))
+            else:
+                raise TypeError(f"Cannot flatten {type(estimator).__name__}")
+            members.append((first, len(trees), averaged, offset, weight))
+        
+        # Concatenate the node arrays, shifting child indices by each tree's start
+        sizes = np.array([len(tree['feature']) for tree in trees], dtype=np.int64)
+        roots = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        arrays = {key: np.concatenate([tree[key] for tree in trees]) for key in trees[0] if key != 'depth'}
+        feature, threshold, missing_left = arrays['feature'], arrays['threshold'], arrays['missing_left']
+        
+        shift = np.repeat(roots, sizes)
+        leaf = arrays['left'] < 0
+        nodes = np.arange(len(feature), dtype=np.int64)
+        left = np.where(leaf, nodes, arrays['left'] + shift)
+        right = np.where(leaf, nodes, arrays['right'] + shift)
+        feature[leaf] = 0
+        threshold[leaf] = np.inf
+        missing_left[leaf] = True
+        
+        depth = max(tree['depth'] for tree in trees)
+        n_features = int(getattr(model, 'n_features_in_', feature.max() + 1))
+        return cls(feature, threshold, left, right, missing_left, arrays['value'], roots,
+                   depth, n_features, members)
+    
+    def leaves(self, X):
+        """
+        Find the leaf every row reaches in every tree
+        
+        Args:
+            X (np.ndarray): Feature rows, shape (n_samples, n_features)
+            
+        Returns:
+            np.ndarray: Leaf node indices, shape (n_samples, n_trees)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            x = X[rows, self.feature[node]]
+            go_left = (x <= self.threshold[node]) | (np.isnan(x) & self.missing_left[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+    
+    def predict(self, X):
+        """
+        Predict like the exported model's predict
+        
+        Args:
+            X (np.ndarray): Feature rows, shape (n_samples, n_features)
+            
+        Returns:
+            np.ndarray: One prediction per row
+        """
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got shape {X.shape}")
+        
+        values = self.value[self.leaves(X)]
+        predictions = []
+        for first, end, averaged, offset, weight in self.members:
+            # cumsum adds the trees in order onto the starting value, as sklearn
+            # does, so the result matches model.predict bit for bit
+            block = np.column_stack([np.full(len(X), offset), values[:, first:end]])
+            predictions.append(np.cumsum(block, axis=1)[:, -1] / averaged)
+        return np.average(np.column_stack(predictions), axis=1, weights=self.weights)
+    
+    def memory_usage(self):
+        """Bytes held by the node arrays"""
+        return sum(array.nbytes for array in (
+            self.feature, self.threshold, self.left, self.right,
+            self.missing_left, self.value, self.roots
+        ))
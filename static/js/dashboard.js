@@ -197,8 +197,14 @@ async function trainModel() {
         });
         const data = await response.json();
         
-        if (data.success) {
-            showNotification('Model trained successfully! Accuracy: ' + (data.metrics.accuracy * 100).toFixed(2) + '%', 'success');
+        if (data.success || response.status === 409) {
+            // Training runs in the background; poll the job until it finishes
+            const job = await waitForTrainingJob(data.job.id);
+            if (job.status === 'succeeded') {
+                showNotification('Model trained successfully! Accuracy: ' + (job.result.metrics.accuracy * 100).toFixed(2) + '%', 'success');
+            } else {
+                showNotification('Model training ' + job.status + ': ' + job.error, 'danger');
+            }
         } else {
             showNotification('Error training model: ' + data.error, 'danger');
         }
@@ -210,6 +216,20 @@ async function trainModel() {
     button.disabled = false;
 }
 
+async function waitForTrainingJob(jobId) {
+    while (true) {
+        const response = await fetch('/api/train_model/jobs/' + jobId);
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error);
+        }
+        if (['succeeded', 'failed', 'cancelled'].includes(data.job.status)) {
+            return data.job;
+        }
+        await new Promise(resolve => setTimeout(resolve, 2000));
+    }
+}
+
 function showNotification(message, type) {
     const notification = document.createElement('div');
     notification.className = `alert alert-${type} alert-dismissible fade show position-fixed top-0 end-0 m-3`;
@@ -3,6 +3,8 @@
 let currentResults = null;
 let selectedMedicines = [];
 let recognition = null;
+// Server-side interaction session: token plus the list the server last saw
+let interactionSession = { token: null, medications: [] };
 
 // Initialize Speech Recognition
 if ('webkitSpeechRecognition' in window || 'SpeechRecognition' in window) {
@@ -161,16 +163,23 @@ async function removeMedicine(medicine) {
     }
 }
 
-// Check drug interactions
+// Check drug interactions, sending only the medicines added or removed
 async function checkInteractions() {
     try {
-        const response = await fetch('/api/check_interactions', {
-            method: 'POST',
-            headers: {'Content-Type': 'application/json'},
-            body: JSON.stringify({ medications: selectedMedicines })
-        });
+        let data = await postInteractionSession(interactionSession.token ? {
+            token: interactionSession.token,
+            add: selectedMedicines.filter(m => !interactionSession.medications.includes(m)),
+            remove: interactionSession.medications.filter(m => !selectedMedicines.includes(m))
+        } : { medications: selectedMedicines });
         
-        const data = await response.json();
+        // Session expired on the server: start over with the full list
+        if (data.expired) {
+            data = await postInteractionSession({ medications: selectedMedicines });
+        }
+        
+        if (data.success) {
+            interactionSession = { token: data.token, medications: data.medications };
+        }
         
         if (data.success && data.summary.total > 0) {
             displayInteractions(data.summary);
@@ -182,6 +191,20 @@ async function checkInteractions() {
     }
 }
 
+async function postInteractionSession(body) {
+    const response = await fetch('/api/check_interactions/session', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(body)
+    });
+    
+    if (response.status === 410) {
+        return { success: false, expired: true };
+    }
+    
+    return response.json();
+}
+
 // Display interaction warnings
 function displayInteractions(summary) {
     const warningsDiv = document.getElementById('interactionWarnings');
@@ -0,0 +1,32 @@
+import pandas as pd
+from utils.medicine_db import MedicineDatabase
+
+def test_loads_csv_without_side_effect_or_use_columns(tmp_path):
+    # No sideEffect*/use* columns leaves those packed lists empty
+    db_path = tmp_path / 'medicines.csv'
+    pd.DataFrame({
+        'id': [1, 2, 3],
+        'name': ['Aspirin 75 Tablet', 'Paracetamol 500 Tablet', 'Ibuprofen 400 Tablet'],
+        'substitute0': ['Ecosprin 75 Tablet', None, None],
+        'Therapeutic Class': ['PAIN ANALGESICS', 'PAIN ANALGESICS', 'PAIN ANALGESICS']
+    }).to_csv(db_path, index=False)
+    
+    database = MedicineDatabase(str(db_path), snapshot_path=str(tmp_path / 'medicines.snapshot'))
+    
+    assert len(database.medicines_db) == 3
+    assert database.search_medicine('aspirin')
+    assert database.get_medicine_substitutes('aspirin 75 tablet') == ['Ecosprin 75 Tablet']
+    assert database.get_medicines_by_therapeutic_class('analgesic', limit=2) == [
+        'Aspirin 75 Tablet', 'Paracetamol 500 Tablet'
+    ]
+    assert database.find_by_side_effects(['nausea'])['total'] == 0
+    assert database.find_by_uses(['pain'])['total'] == 0
+
+def test_queries_on_missing_csv_return_empty_results(tmp_path):
+    database = MedicineDatabase(str(tmp_path / 'missing.csv'))
+    
+    assert database.search_medicine('aspirin') == []
+    assert database.get_medicines_by_therapeutic_class('analgesic') == []
+    for page in (database.find_by_side_effects(['nausea']), database.find_by_uses(['pain'])):
+        assert page['total'] == 0
+        assert page['medicines'] == []
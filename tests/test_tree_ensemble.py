@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import (RandomForestRegressor, GradientBoostingRegressor,
+                              HistGradientBoostingRegressor, VotingRegressor)
+from sklearn.preprocessing import StandardScaler
+from model.predictor import AdherencePredictor
+from model.tree_ensemble import FlatTreeEnsemble
+from utils.data_generator import generate_sample_data
+
+GENDERS = {code: name for name, code in AdherencePredictor.GENDER_CODES.items()}
+
+@pytest.fixture(scope='module')
+def training_data(tmp_path_factory):
+    """Generated patients and their features in the training layout"""
+    # The generator writes data/training_data.csv under the working directory
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(tmp_path_factory.mktemp('data'))
+        df = generate_sample_data(400)
+    
+    X = df.drop(['adherence_score', 'adherent'], axis=1)
+    X = pd.concat([X.drop('gender', axis=1), pd.get_dummies(X['gender'], prefix='gender')], axis=1)
+    return df, X, df['adherence_score'].to_numpy()
+
+def ensemble(boosting):
+    """Small version of the ensemble train_model fits"""
+    if boosting == 'histogram':
+        gb = HistGradientBoostingRegressor(max_iter=20, max_depth=5, max_leaf_nodes=None,
+                                           early_stopping=False, random_state=42)
+    else:
+        gb = GradientBoostingRegressor(n_estimators=20, max_depth=5, subsample=0.8, random_state=42)
+    rf = RandomForestRegressor(n_estimators=20, max_depth=10, max_features='sqrt', random_state=42)
+    return VotingRegressor(estimators=[('rf', rf), ('gb', gb)], weights=[1, 1])
+
+@pytest.mark.parametrize('boosting', ['gradient', 'histogram'])
+def test_flat_ensemble_matches_model_predict(training_data, boosting):
+    _, X, y = training_data
+    raw = X.to_numpy(dtype=float)
+    scaled = StandardScaler().fit_transform(raw)
+    
+    for rows in (raw, scaled):
+        model = ensemble(boosting).fit(rows, y)
+        flat = FlatTreeEnsemble.from_model(model)
+        # Each set of rows is also scored by the model fitted on the other
+        for X_eval in (raw, scaled):
+            np.testing.assert_array_equal(flat.predict(X_eval), model.predict(X_eval))
+
+@pytest.mark.parametrize('count', [50, AdherencePredictor.FLAT_MODEL_MAX_ROWS + 50])
+def test_predict_batch_matches_single_predictions(training_data, tmp_path, monkeypatch, count):
+    df, X, y = training_data
+    monkeypatch.chdir(tmp_path)
+    predictor = AdherencePredictor(load=False)
+    predictor.model = ensemble('gradient').fit(X.to_numpy(dtype=float), y)
+    predictor.uses_gender_dummies = True
+    predictor.feature_names = X.columns.tolist()
+    predictor._index_features()
+    predictor._export_model()
+    
+    patients = [
+        dict(row, gender=GENDERS[row['gender']])
+        for row in df[AdherencePredictor.PATIENT_FIELDS + ['gender']].head(count).to_dict('records')
+    ]
+    assert predictor.predict_batch(patients) == [predictor.predict(patient) for patient in patients]
@@ -0,0 +1,175 @@
+"""
+Background jobs with progress reporting and cancellation
+Runs long tasks such as model training outside the request thread; clients
+start a job, poll its status by id and may cancel it
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been asked to stop"""
+
+class JobAlreadyRunning(RuntimeError):
+    """Raised when a job is started while another one is still running"""
+    
+    def __init__(self, job):
+        super().__init__(f"Job {job['id']} is still {job['status']}")
+        self.job = job
+
+class JobContext:
+    """Handed to the job function to report progress and notice cancellation"""
+    
+    def __init__(self, jobs, job_id):
+        self._jobs = jobs
+        self.job_id = job_id
+        self.cancel_requested = threading.Event()
+    
+    def update(self, stage, progress):
+        """
+        Record the stage the job is entering
+        
+        Also the point where cancellation takes effect: work already running
+        between two updates is not interrupted.
+        
+        Args:
+            stage (str): Description of the current stage
+            progress (float): Fraction of the job done, 0 to 1
+            
+        Raises:
+            JobCancelled: If the job has been cancelled
+        """
+        if self.cancel_requested.is_set():
+            raise JobCancelled(f"Cancelled before {stage}")
+        self._jobs._update(self.job_id, stage=stage, progress=round(progress, 3))
+
+class BackgroundJobs:
+    """
+    Runs one job at a time in a background thread and keeps recent job states
+    
+    The job function is called as target(context) and its return value is
+    stored as the job result. Job states are kept in memory, so each process
+    only knows the jobs it started.
+    """
+    
+    def __init__(self, name, target, max_history=20):
+        """
+        Args:
+            name (str): Name used for job threads
+            target (callable): Job function taking a JobContext, returning a JSON-serializable result
+            max_history (int): Finished jobs kept for status queries
+        """
+        self.name = name
+        self.target = target
+        self.max_history = max_history
+        self._jobs = OrderedDict()
+        self._contexts = {}
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """
+        Start a new job
+        
+        Returns:
+            dict: State of the new job
+            
+        Raises:
+            JobAlreadyRunning: If a job is queued or running
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job['status'] in ('queued', 'running'):
+                    raise JobAlreadyRunning(dict(job))
+            
+            job_id = uuid.uuid4().hex[:12]
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'stage': None,
+                'progress': 0.0,
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'duration_seconds': None,
+                'cancel_requested': False,
+                'result': None,
+                'error': None
+            }
+            self._contexts[job_id] = JobContext(self, job_id)
+            self._trim()
+            job = dict(self._jobs[job_id])
+        
+        threading.Thread(target=self._run, args=(job_id,), name=f'{self.name}-{job_id}', daemon=True).start()
+        return job
+    
+    def get(self, job_id):
+        """
+        Get the state of a job
+        
+        Returns:
+            dict: Job state, or None for an unknown id
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+    
+    def list(self):
+        """
+        Get the state of every known job
+        
+        Returns:
+            list: Job states, newest first
+        """
+        with self._lock:
+            return [dict(job) for job in reversed(self._jobs.values())]
+    
+    def cancel(self, job_id):
+        """
+        Ask a job to stop at its next progress update
+        
+        Returns:
+            bool: True if the job was still queued or running
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] not in ('queued', 'running'):
+                return False
+            job['cancel_requested'] = True
+            self._contexts[job_id].cancel_requested.set()
+            return True
+    
+    def _run(self, job_id):
+        """Run the job function and record how it ended"""
+        context = self._contexts[job_id]
+        start = time.perf_counter()
+        self._update(job_id, status='running', started_at=datetime.now().isoformat())
+        try:
+            # A job cancelled while queued never starts its work
+            if context.cancel_requested.is_set():
+                raise JobCancelled('Cancelled before start')
+            result = self.target(context)
+            outcome = {'status': 'succeeded', 'progress': 1.0, 'result': result}
+        except JobCancelled as e:
+            outcome = {'status': 'cancelled', 'error': str(e)}
+        except Exception as e:
+            print(f"Error in {self.name} job {job_id}: {e}")
+            outcome = {'status': 'failed', 'error': str(e)}
+        
+        self._update(job_id, finished_at=datetime.now().isoformat(),
+                     duration_seconds=round(time.perf_counter() - start, 3), **outcome)
+        with self._lock:
+            self._contexts.pop(job_id, None)
+    
+    def _update(self, job_id, **fields):
+        """Update fields of a job's state"""
+        with self._lock:
+            self._jobs[job_id].update(fields)
+    
+    def _trim(self):
+        """Forget the oldest finished jobs beyond max_history"""
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] not in ('queued', 'running')]
+        for job_id in finished[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job_id]
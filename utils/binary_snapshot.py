@@ -0,0 +1,142 @@
+"""
+Binary snapshot files for precomputed dataset indexes
+Stores numpy arrays uncompressed and aligned so they can be memory-mapped
+back on the next start instead of re-parsing the source CSV
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import numpy as np
+
+# File layout: magic, container version, header length, JSON header, arrays
+MAGIC = b'MTSNAP\x00\x00'
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<8sII')
+ALIGNMENT = 8
+
+def source_signature(path):
+    """
+    Identify the current version of a source file
+    
+    Args:
+        path (str): Path to the source file
+        
+    Returns:
+        dict: File size and modification time in nanoseconds
+    """
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def encode_strings(values):
+    """
+    Pack strings into an offsets array and a UTF-8 byte pool
+    
+    Args:
+        values (list): Strings to pack
+        
+    Returns:
+        tuple: (int64 offsets of length n + 1, uint8 byte pool)
+    """
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    pool = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return offsets, pool
+
+def decode_string(offsets, pool, index):
+    """Decode a single string from a packed pool"""
+    return bytes(pool[offsets[index]:offsets[index + 1]]).decode('utf-8')
+
+def decode_strings(offsets, pool):
+    """
+    Unpack every string from a packed pool
+    
+    Args:
+        offsets (np.ndarray): Offsets array from encode_strings
+        pool (np.ndarray): Byte pool from encode_strings
+        
+    Returns:
+        list: Decoded strings
+    """
+    data = bytes(pool)
+    bounds = offsets.tolist()
+    return [data[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(len(bounds) - 1)]
+
+def write_snapshot(path, arrays, metadata):
+    """
+    Write arrays and metadata to a snapshot file
+    
+    The file is written next to its final location and moved into place,
+    so readers never see a partially written snapshot.
+    
+    Args:
+        path (str): Snapshot file path
+        arrays (dict): Array name to numpy array
+        metadata (dict): JSON-serializable metadata
+    """
+    entries = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        entries.append({
+            'name': name,
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': offset
+        })
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    
+    header = json.dumps({'metadata': metadata, 'arrays': entries}).encode('utf-8')
+    data_start = -(-(PREAMBLE.size + len(header)) // ALIGNMENT) * ALIGNMENT
+    
+    # A unique temporary file per call: threads of one process may write the same snapshot
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            f.write(header)
+            for entry, array in zip(entries, arrays.values()):
+                f.seek(data_start + entry['offset'])
+                f.write(np.ascontiguousarray(array).tobytes())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_snapshot(path):
+    """
+    Memory-map a snapshot file
+    
+    Args:
+        path (str): Snapshot file path
+        
+    Returns:
+        tuple: (metadata dict, dict of read-only arrays backed by the file)
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    magic, version, header_length = PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format in {path}")
+    
+    header = json.loads(bytes(buffer[PREAMBLE.size:PREAMBLE.size + header_length]))
+    data_start = -(-(PREAMBLE.size + header_length) // ALIGNMENT) * ALIGNMENT
+    
+    arrays = {}
+    for entry in header['arrays']:
+        dtype = np.dtype(entry['dtype'])
+        count = int(np.prod(entry['shape'], dtype=np.int64))
+        if count == 0:
+            arrays[entry['name']] = np.empty(entry['shape'], dtype=dtype)
+            continue
+        array = np.frombuffer(buffer, dtype=dtype, count=count,
+                              offset=data_start + entry['offset'])
+        arrays[entry['name']] = array.reshape(entry['shape'])
+    
+    return header['metadata'], arrays
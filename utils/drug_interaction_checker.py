@@ -1,85 +1,393 @@
 import pandas as pd
+import numpy as np
 import os
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict
+from utils.binary_snapshot import (
+    source_signature, encode_strings, decode_string, decode_strings,
+    write_snapshot, read_snapshot
+)
 
 class DrugInteractionChecker:
     """
     Checks for drug-drug interactions using the drug interactions database
     """
     
-    def __init__(self, db_path='use_dataset/db_drug_interactions.csv'):
+    # Severity levels, ordered by their int8 code in the Severity column
+    SEVERITY_LEVELS = ['low', 'medium', 'high']
+    
+    # High severity keywords
+    HIGH_KEYWORDS = ['severe', 'toxic', 'fatal', 'dangerous', 'contraindicated',
+                     'life-threatening', 'cardiotoxic', 'hepatotoxic', 'nephrotoxic']
+    
+    # Medium severity keywords
+    MEDIUM_KEYWORDS = ['increased', 'decreased', 'may increase', 'may decrease',
+                       'adverse effects', 'side effects', 'risk']
+    
+    # One matcher for every keyword. The lookahead reports a match starting at
+    # each position, so overlapping keywords are never hidden behind each other.
+    SEVERITY_PATTERN = re.compile(
+        '(?=(' + '|'.join(re.escape(k) for k in HIGH_KEYWORDS + MEDIUM_KEYWORDS) + '))'
+    )
+    
+    # Bump whenever the arrays stored in the snapshot change meaning
+    SNAPSHOT_VERSION = 1
+    SNAPSHOT_ARRAYS = [
+        'drug1_ids', 'drug2_ids', 'severity_codes',
+        'description_codes', 'description_offsets', 'description_pool',
+        'pair_keys', 'pair_low_rows', 'pair_high_rows',
+        'adjacency_offsets', 'adjacency_neighbors', 'adjacency_rows', 'adjacency_severity'
+    ]
+    
+    def __init__(self, db_path='use_dataset/db_drug_interactions.csv', snapshot_path=None):
         self.db_path = db_path
-        self.interactions_db = None
+        self.snapshot_path = snapshot_path or os.path.splitext(db_path)[0] + '.snapshot'
+        self._interactions_db = None
+        self.drug_ids = {}
+        self.drug_names = []
+        self.pair_index = {}
+        # Optional DrugNameResolver mapping brand names to interaction drugs
+        self.name_resolver = None
         self.load_database()
     
     def load_database(self):
-        """Load the drug interactions database"""
+        """Load the drug interactions database, from its snapshot when it is current"""
         try:
             if os.path.exists(self.db_path):
-                self.interactions_db = pd.read_csv(self.db_path)
-                # Normalize drug names to lowercase for better matching
-                self.interactions_db['Drug 1'] = self.interactions_db['Drug 1'].str.lower().str.strip()
-                self.interactions_db['Drug 2'] = self.interactions_db['Drug 2'].str.lower().str.strip()
-                print(f"Loaded {len(self.interactions_db)} drug interactions")
+                if not self._load_snapshot():
+                    self._load_csv()
+                    self._save_snapshot()
+                print(f"Loaded {len(self.drug1_ids)} drug interactions")
             else:
                 print(f"Warning: Database file not found at {self.db_path}")
-                self.interactions_db = pd.DataFrame(columns=['Drug 1', 'Drug 2', 'Interaction Description'])
+                self._build_arrays(pd.DataFrame(columns=['Drug 1', 'Drug 2', 'Interaction Description']))
         except Exception as e:
             print(f"Error loading drug interactions database: {e}")
-            self.interactions_db = pd.DataFrame(columns=['Drug 1', 'Drug 2', 'Interaction Description'])
+            self._build_arrays(pd.DataFrame(columns=['Drug 1', 'Drug 2', 'Interaction Description']))
+    
+    def _load_csv(self):
+        """Parse the interactions CSV and build the index arrays from it"""
+        interactions_db = pd.read_csv(self.db_path)
+        # Normalize drug names to lowercase for better matching
+        interactions_db['Drug 1'] = interactions_db['Drug 1'].str.lower().str.strip()
+        interactions_db['Drug 2'] = interactions_db['Drug 2'].str.lower().str.strip()
+        self._build_arrays(interactions_db)
+    
+    def _load_snapshot(self):
+        """
+        Memory-map the snapshot if it was built from the current CSV
+        
+        Returns:
+            bool: True if the snapshot was loaded
+        """
+        if not os.path.exists(self.snapshot_path):
+            return False
+        
+        try:
+            metadata, arrays = read_snapshot(self.snapshot_path)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable interactions snapshot: {e}")
+            return False
+        
+        if (metadata.get('version') != self.SNAPSHOT_VERSION or
+                metadata.get('source') != source_signature(self.db_path) or
+                metadata.get('keywords') != self.HIGH_KEYWORDS + self.MEDIUM_KEYWORDS):
+            return False
+        
+        for name in self.SNAPSHOT_ARRAYS:
+            setattr(self, name, arrays[name])
+        self._interactions_db = None
+        self.drug_names = decode_strings(arrays['drug_name_offsets'], arrays['drug_name_pool'])
+        self._build_lookups()
+        return True
+    
+    def _save_snapshot(self):
+        """Write the index arrays to the snapshot file for the next start"""
+        arrays = {name: getattr(self, name) for name in self.SNAPSHOT_ARRAYS}
+        arrays['drug_name_offsets'], arrays['drug_name_pool'] = encode_strings(self.drug_names)
+        
+        metadata = {
+            'version': self.SNAPSHOT_VERSION,
+            'source': source_signature(self.db_path),
+            'keywords': self.HIGH_KEYWORDS + self.MEDIUM_KEYWORDS
+        }
+        
+        try:
+            write_snapshot(self.snapshot_path, arrays, metadata)
+        except OSError as e:
+            print(f"Warning: Could not write interactions snapshot: {e}")
+    
+    @property
+    def interactions_db(self):
+        """The interactions as a DataFrame, decoded from the index arrays on first use"""
+        if self._interactions_db is None:
+            # Index -1 (missing value) picks up the trailing None
+            names = np.array(self.drug_names + [None], dtype=object)
+            descriptions = np.array(
+                decode_strings(self.description_offsets, self.description_pool) + [None],
+                dtype=object
+            )
+            self._interactions_db = pd.DataFrame({
+                'Drug 1': names[self.drug1_ids],
+                'Drug 2': names[self.drug2_ids],
+                'Interaction Description': descriptions[self.description_codes],
+                'Severity': pd.Categorical.from_codes(self.severity_codes,
+                                                      categories=self.SEVERITY_LEVELS)
+            })
+        return self._interactions_db
+    
+    def _build_arrays(self, interactions_db):
+        """
+        Build the interned drug table and the lookup structures over it
+        
+        Every drug name gets an integer id and every distinct description is
+        stored once in a string pool; the pair index and the adjacency arrays
+        are both built from the per-row id arrays.
+        
+        Args:
+            interactions_db (pd.DataFrame): Interactions with normalized names
+        """
+        drug1 = interactions_db['Drug 1'].to_numpy(dtype=object)
+        drug2 = interactions_db['Drug 2'].to_numpy(dtype=object)
+        
+        codes, names = pd.factorize(np.concatenate([drug1, drug2]))
+        self.drug_names = names.tolist()
+        self.drug1_ids = codes[:len(drug1)].astype(np.int32)
+        self.drug2_ids = codes[len(drug1):].astype(np.int32)
+        
+        # Many rows share a description, so only store and classify each distinct one
+        description_codes, descriptions = pd.factorize(interactions_db['Interaction Description'])
+        descriptions = [str(d) for d in descriptions]
+        self.description_codes = description_codes.astype(np.int32)
+        self.description_offsets, self.description_pool = encode_strings(descriptions)
+        
+        # The trailing 0 ('low') is picked up by missing descriptions (code -1)
+        levels = np.array(self._classify_descriptions(descriptions) + [0], dtype=np.int8)
+        self.severity_codes = levels[description_codes]
+        
+        self._interactions_db = None
+        self._build_pair_index()
+        self._build_adjacency()
+        self._build_lookups()
+    
+    def _classify_descriptions(self, descriptions):
+        """
+        Classify interaction descriptions
+        
+        Args:
+            descriptions (list): Distinct interaction descriptions
+            
+        Returns:
+            list: Severity code (index into SEVERITY_LEVELS) per description
+        """
+        return [self.SEVERITY_LEVELS.index(self._classify_severity(d)) for d in descriptions]
+    
+    def _build_pair_index(self):
+        """
+        Build the pair lookup arrays
+        
+        Pairs are keyed on low * n_drugs + high for the unordered id pair and
+        store the first row found in each direction: pair_low_rows holds the
+        first row with Drug 1 = low, pair_high_rows the first row with
+        Drug 1 = high. Missing directions are -1.
+        """
+        # Rows with a missing drug name can never match a query
+        valid = (self.drug1_ids >= 0) & (self.drug2_ids >= 0)
+        rows = np.flatnonzero(valid)
+        ids1 = self.drug1_ids[valid].astype(np.int64)
+        ids2 = self.drug2_ids[valid].astype(np.int64)
+        
+        low = np.minimum(ids1, ids2)
+        high = np.maximum(ids1, ids2)
+        slot = (ids1 != low).astype(np.int64)
+        
+        # Keep only the first row for each (pair, direction)
+        directed, first = np.unique((low * len(self.drug_names) + high) * 2 + slot,
+                                    return_index=True)
+        pair_keys, position = np.unique(directed // 2, return_inverse=True)
+        
+        pair_low_rows = np.full(len(pair_keys), -1, dtype=np.int32)
+        pair_high_rows = np.full(len(pair_keys), -1, dtype=np.int32)
+        from_high = (directed % 2).astype(bool)
+        pair_low_rows[position[~from_high]] = rows[first[~from_high]]
+        pair_high_rows[position[from_high]] = rows[first[from_high]]
+        
+        self.pair_keys = pair_keys.astype(np.int64)
+        self.pair_low_rows = pair_low_rows
+        self.pair_high_rows = pair_high_rows
+    
+    def _build_adjacency(self):
+        """
+        Build CSR-style adjacency arrays over the interaction graph
+        
+        The interactions of drug d are positions adjacency_offsets[d] up to
+        adjacency_offsets[d + 1] of the neighbor, row and severity arrays,
+        in the same order as the rows appear in the database.
+        """
+        ids1 = self.drug1_ids
+        ids2 = self.drug2_ids
+        rows = np.arange(len(ids1))
+        
+        # Each row is listed under both drugs, self-interactions only once
+        distinct = ids1 != ids2
+        source = np.concatenate([ids1, ids2[distinct]])
+        neighbors = np.concatenate([ids2, ids1[distinct]])
+        edge_rows = np.concatenate([rows, rows[distinct]])
+        
+        listed = source >= 0
+        source = source[listed]
+        neighbors = neighbors[listed]
+        edge_rows = edge_rows[listed]
+        
+        order = np.lexsort((edge_rows, source))
+        offsets = np.zeros(len(self.drug_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source, minlength=len(self.drug_names)), out=offsets[1:])
+        
+        self.adjacency_offsets = offsets
+        self.adjacency_neighbors = neighbors[order].astype(np.int32)
+        self.adjacency_rows = edge_rows[order].astype(np.int32)
+        self.adjacency_severity = self.severity_codes[edge_rows[order]]
+    
+    def _build_lookups(self):
+        """Build the dictionaries that map names and pair keys into the arrays"""
+        self.drug_ids = {name: i for i, name in enumerate(self.drug_names)}
+        self.pair_index = dict(zip(self.pair_keys.tolist(), range(len(self.pair_keys))))
+    
+    def memory_usage(self):
+        """
+        Approximate memory held by the index structures
+        
+        Returns:
+            int: Size in bytes (memory-mapped arrays included)
+        """
+        size = sum(getattr(self, name).nbytes for name in self.SNAPSHOT_ARRAYS)
+        size += sys.getsizeof(self.drug_ids) + sys.getsizeof(self.pair_index)
+        size += sum(sys.getsizeof(name) for name in self.drug_names)
+        return size
+    
+    def _description(self, row):
+        """Get the interaction description for a row, or None if it is missing"""
+        code = self.description_codes[row]
+        if code < 0:
+            return None
+        return decode_string(self.description_offsets, self.description_pool, code)
+    
+    def resolve_generic_names(self, medication):
+        """
+        Get the interaction database names a medication name stands for
+        
+        Args:
+            medication (str): Medication name, brand or generic
+            
+        Returns:
+            tuple: Interaction drug names, best match first
+        """
+        name = medication.lower().strip()
+        if self.name_resolver is not None:
+            return self.name_resolver.resolve(name)
+        return (name,) if name in self.drug_ids else ()
+    
+    def _resolve_ids(self, medication):
+        """Get the interaction drug ids for a medication name, best match first"""
+        return [self.drug_ids[name] for name in self.resolve_generic_names(medication)
+                if name in self.drug_ids]
+    
+    def _lookup_pair(self, drug1, drug2):
+        """
+        Find the interaction row for a pair of medication names
+        
+        Each name may resolve to several interaction drugs; the first pair
+        of them that interacts, in resolution order, wins.
+        
+        Args:
+            drug1 (str): First medication name
+            drug2 (str): Second medication name
+            
+        Returns:
+            int: Row of the interaction, or -1 if there is none
+        """
+        return self._first_interaction(self._resolve_ids(drug1), self._resolve_ids(drug2))
+    
+    def _first_interaction(self, ids1, ids2):
+        """Find the first interacting pair of ids, in resolution order"""
+        for id1 in ids1:
+            for id2 in ids2:
+                row = self._lookup_ids(id1, id2)
+                if row >= 0:
+                    return row
+        return -1
+    
+    def _lookup_ids(self, id1, id2):
+        """
+        Find the interaction row for a pair of drug ids
+        
+        Args:
+            id1 (int): First drug id
+            id2 (int): Second drug id
+            
+        Returns:
+            int: Row of the interaction, or -1 if there is none
+        """
+        low, high = min(id1, id2), max(id1, id2)
+        position = self.pair_index.get(low * len(self.drug_names) + high)
+        if position is None:
+            return -1
+        
+        if id1 <= id2:
+            forward = self.pair_low_rows[position]
+            reverse = self.pair_high_rows[position]
+        else:
+            forward = self.pair_high_rows[position]
+            reverse = self.pair_low_rows[position]
+        
+        # Drug 1 -> Drug 2 takes precedence over the reverse direction
+        return int(forward if forward >= 0 else reverse)
     
     def check_interactions(self, medications):
         """
         Check for interactions between a list of medications
         
+        Brand names are mapped to the generic names of the interactions
+        database when a name_resolver is set.
+        
         Args:
             medications (list): List of medication names
             
         Returns:
             list: List of interaction warnings
         """
-        if self.interactions_db is None or len(self.interactions_db) == 0:
+        if len(self.drug1_ids) == 0:
             return []
         
         interactions = []
         
-        # Normalize medication names
-        normalized_meds = [med.lower().strip() for med in medications]
+        # Resolve each medication name to interaction drug ids once
+        resolved = [self._resolve_ids(med) for med in medications]
         
         # Check all pairs
-        for i in range(len(normalized_meds)):
-            for j in range(i + 1, len(normalized_meds)):
-                drug1 = normalized_meds[i]
-                drug2 = normalized_meds[j]
-                
-                # Check both directions
-                interaction1 = self.interactions_db[
-                    (self.interactions_db['Drug 1'] == drug1) & 
-                    (self.interactions_db['Drug 2'] == drug2)
-                ]
-                
-                interaction2 = self.interactions_db[
-                    (self.interactions_db['Drug 1'] == drug2) & 
-                    (self.interactions_db['Drug 2'] == drug1)
-                ]
+        for i in range(len(resolved)):
+            for j in range(i + 1, len(resolved)):
+                row = self._first_interaction(resolved[i], resolved[j])
                 
                 # Add found interactions
-                if not interaction1.empty:
-                    interactions.append({
-                        'drug1': medications[i],
-                        'drug2': medications[j],
-                        'description': interaction1.iloc[0]['Interaction Description'],
-                        'severity': self._classify_severity(interaction1.iloc[0]['Interaction Description'])
-                    })
-                elif not interaction2.empty:
-                    interactions.append({
-                        'drug1': medications[i],
-                        'drug2': medications[j],
-                        'description': interaction2.iloc[0]['Interaction Description'],
-                        'severity': self._classify_severity(interaction2.iloc[0]['Interaction Description'])
-                    })
+                if row >= 0:
+                    interactions.append(self._format_interaction(row, medications[i], medications[j]))
         
         return interactions
     
+    def _format_interaction(self, row, drug1, drug2):
+        """Build the interaction warning dict for a row and the names as given"""
+        return {
+            'drug1': drug1,
+            'drug2': drug2,
+            'description': self._description(row),
+            'severity': self.SEVERITY_LEVELS[self.severity_codes[row]]
+        }
+    
     def _classify_severity(self, description):
         """
         Classify interaction severity based on description keywords
@@ -90,22 +398,14 @@ class DrugInteractionChecker:
         Returns:
             str: Severity level (high, medium, low)
         """
-        description_lower = description.lower()
-        
-        # High severity keywords
-        high_keywords = ['severe', 'toxic', 'fatal', 'dangerous', 'contraindicated', 
-                        'life-threatening', 'cardiotoxic', 'hepatotoxic', 'nephrotoxic']
+        severity = 'low'
         
-        # Medium severity keywords
-        medium_keywords = ['increased', 'decreased', 'may increase', 'may decrease',
-                          'adverse effects', 'side effects', 'risk']
+        for match in self.SEVERITY_PATTERN.finditer(description.lower()):
+            if match.group(1) in self.HIGH_KEYWORDS:
+                return 'high'
+            severity = 'medium'
         
-        if any(keyword in description_lower for keyword in high_keywords):
-            return 'high'
-        elif any(keyword in description_lower for keyword in medium_keywords):
-            return 'medium'
-        else:
-            return 'low'
+        return severity
     
     def search_drug(self, drug_name):
         """
@@ -117,28 +417,83 @@ class DrugInteractionChecker:
         Returns:
             list: List of all known interactions for this drug
         """
-        if self.interactions_db is None or len(self.interactions_db) == 0:
+        drug_ids = self._resolve_ids(drug_name)
+        if not drug_ids:
             return []
+        drug_id = drug_ids[0]
         
-        drug_name_lower = drug_name.lower().strip()
+        # All interactions for this drug are one contiguous slice
+        start = self.adjacency_offsets[drug_id]
+        end = self.adjacency_offsets[drug_id + 1]
         
-        # Find all interactions involving this drug
-        interactions = self.interactions_db[
-            (self.interactions_db['Drug 1'] == drug_name_lower) | 
-            (self.interactions_db['Drug 2'] == drug_name_lower)
-        ]
+        return self._format_neighbors(np.arange(start, end))
+    
+    def _format_neighbors(self, positions):
+        """
+        Build interaction dicts for positions in the adjacency arrays
         
+        Args:
+            positions (np.ndarray): Positions in the adjacency arrays
+            
+        Returns:
+            list: Interaction dicts as returned by search_drug
+        """
         results = []
-        for _, row in interactions.iterrows():
-            other_drug = row['Drug 2'] if row['Drug 1'] == drug_name_lower else row['Drug 1']
+        for neighbor, row, severity in zip(self.adjacency_neighbors[positions].tolist(),
+                                           self.adjacency_rows[positions].tolist(),
+                                           self.adjacency_severity[positions].tolist()):
             results.append({
-                'interacting_drug': other_drug,
-                'description': row['Interaction Description'],
-                'severity': self._classify_severity(row['Interaction Description'])
+                'interacting_drug': self.drug_names[neighbor] if neighbor >= 0 else None,
+                'description': self._description(row),
+                'severity': self.SEVERITY_LEVELS[severity]
             })
         
         return results
     
+    def get_neighborhood(self, drug_name, severity=None, offset=0, limit=50):
+        """
+        Get one page of the interactions known for a drug
+        
+        Args:
+            drug_name (str): Name of the drug
+            severity (list): Severity levels to keep, or None for all
+            offset (int): Number of matching interactions to skip
+            limit (int): Maximum number of interactions to return
+            
+        Returns:
+            dict: Page of interactions with totals and counts by severity
+        """
+        if severity:
+            unknown = [level for level in severity if level not in self.SEVERITY_LEVELS]
+            if unknown:
+                raise ValueError(f"Unknown severity level: {', '.join(unknown)}")
+        
+        drug_ids = self._resolve_ids(drug_name)
+        if not drug_ids:
+            positions = np.empty(0, dtype=np.int64)
+        else:
+            positions = np.arange(self.adjacency_offsets[drug_ids[0]],
+                                  self.adjacency_offsets[drug_ids[0] + 1])
+        
+        severity_codes = self.adjacency_severity[positions]
+        counts = np.bincount(severity_codes, minlength=len(self.SEVERITY_LEVELS))
+        
+        if severity:
+            wanted = [self.SEVERITY_LEVELS.index(level) for level in severity]
+            positions = positions[np.isin(severity_codes, wanted)]
+        
+        offset = max(0, int(offset))
+        limit = max(0, int(limit))
+        
+        return {
+            'drug': drug_name,
+            'total': len(positions),
+            'offset': offset,
+            'limit': limit,
+            'counts': {level: int(counts[i]) for i, level in enumerate(self.SEVERITY_LEVELS)},
+            'interactions': self._format_neighbors(positions[offset:offset + limit])
+        }
+    
     def get_interaction_summary(self, medications):
         """
         Get a summary of all interactions for a list of medications
@@ -149,8 +504,10 @@ class DrugInteractionChecker:
         Returns:
             dict: Summary with counts by severity
         """
-        interactions = self.check_interactions(medications)
-        
+        return self._summarize(self.check_interactions(medications))
+    
+    def _summarize(self, interactions):
+        """Count interactions by severity in the get_interaction_summary format"""
         summary = {
             'total': len(interactions),
             'high': sum(1 for i in interactions if i['severity'] == 'high'),
@@ -160,3 +517,164 @@ class DrugInteractionChecker:
         }
         
         return summary
+    
+    def check_regimens(self, regimens):
+        """
+        Summarize interactions for many regimens in one pass
+        
+        Drug pairs are deduplicated across all regimens and resolved together
+        against the pair index before any summary is produced.
+        
+        Args:
+            regimens (list): List of medication name lists
+            
+        Yields:
+            dict: Summary per regimen, in order, as from get_interaction_summary
+        """
+        regimen_ids = []
+        pairs = {}
+        for medications in regimens:
+            ids = [self._resolve_ids(med) for med in medications]
+            regimen_ids.append(ids)
+            for i in range(len(ids)):
+                for j in range(i + 1, len(ids)):
+                    for id1 in ids[i]:
+                        for id2 in ids[j]:
+                            pairs.setdefault((id1, id2), len(pairs))
+        
+        pair_rows = self._resolve_pairs(np.array(list(pairs), dtype=np.int64).reshape(-1, 2))
+        
+        for medications, ids in zip(regimens, regimen_ids):
+            interactions = []
+            for i in range(len(ids)):
+                for j in range(i + 1, len(ids)):
+                    # First interacting pair in resolution order, as in _lookup_pair
+                    row = next((pair_rows[pairs[(id1, id2)]] for id1 in ids[i] for id2 in ids[j]
+                                if pair_rows[pairs[(id1, id2)]] >= 0), -1)
+                    if row >= 0:
+                        interactions.append(self._format_interaction(row, medications[i], medications[j]))
+            yield self._summarize(interactions)
+    
+    def _resolve_pairs(self, pairs):
+        """
+        Vectorized form of _lookup_pair over drug id pairs
+        
+        Args:
+            pairs (np.ndarray): (n, 2) array of drug ids
+            
+        Returns:
+            list: Row of the interaction for each pair, or -1 if there is none
+        """
+        if len(pairs) == 0 or len(self.pair_keys) == 0:
+            return [-1] * len(pairs)
+        
+        first, second = pairs[:, 0], pairs[:, 1]
+        keys = np.minimum(first, second) * len(self.drug_names) + np.maximum(first, second)
+        
+        position = np.minimum(np.searchsorted(self.pair_keys, keys), len(self.pair_keys) - 1)
+        found = self.pair_keys[position] == keys
+        low_rows = np.where(found, self.pair_low_rows[position], -1)
+        high_rows = np.where(found, self.pair_high_rows[position], -1)
+        
+        # Drug 1 -> Drug 2 takes precedence over the reverse direction
+        in_order = first <= second
+        forward = np.where(in_order, low_rows, high_rows)
+        reverse = np.where(in_order, high_rows, low_rows)
+        
+        return np.where(forward >= 0, forward, reverse).tolist()
+
+
+class InteractionSessionStore:
+    """
+    Keeps per-regimen pair results so edits only check the pairs they add
+    
+    Each session is identified by a random token and remembers its current
+    medication list plus the interaction row found for every pair in it.
+    Sessions record the dataset generation rather than the checker itself, so
+    a hot reload does not keep old indexes alive; sessions from an older
+    generation are re-checked in full. Sessions expire after ttl seconds
+    without use.
+    """
+    
+    def __init__(self, checker, ttl=900, max_sessions=10000):
+        self.checker = checker
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def update(self, token=None, medications=None, add=None, remove=None):
+        """
+        Create or edit a regimen session and summarize its interactions
+        
+        Args:
+            token (str): Existing session token, or None to start a new session
+            medications (list): Full medication list, replacing the session's list
+            add (list): Medication names to append
+            remove (list): Medication names to drop
+            
+        Returns:
+            tuple: (token, current medication list, interaction summary)
+            
+        Raises:
+            KeyError: If the token is unknown or its session has expired
+        """
+        # Resolve a hot-reloaded checker once so the whole update uses one index.
+        # The generation is read first: a swap can only make it lag the
+        # checker, which costs a full re-check, never a stale cached row.
+        version = getattr(self.checker, 'generation', 0)
+        checker = getattr(self.checker, 'current', self.checker)
+        
+        with self.lock:
+            self._expire()
+            if token is None:
+                token = secrets.token_urlsafe(16)
+                session = {'medications': [], 'pairs': {}, 'version': version}
+            elif token in self.sessions:
+                session = self.sessions[token]
+            else:
+                raise KeyError(token)
+        
+        current = list(session['medications']) if medications is None else list(medications)
+        if remove:
+            removed = {med.lower().strip() for med in remove}
+            current = [med for med in current if med.lower().strip() not in removed]
+        if add:
+            current.extend(add)
+        
+        # Only pairs that were not in the session before are looked up;
+        # cached rows are dropped if the database was reloaded since
+        normalized = [med.lower().strip() for med in current]
+        cached = session['pairs'] if session['version'] == version else {}
+        pairs = {}
+        interactions = []
+        for i in range(len(normalized)):
+            for j in range(i + 1, len(normalized)):
+                pair = (normalized[i], normalized[j])
+                row = cached.get(pair)
+                if row is None:
+                    row = checker._lookup_pair(*pair)
+                pairs[pair] = row
+                if row >= 0:
+                    interactions.append(checker._format_interaction(row, current[i], current[j]))
+        
+        with self.lock:
+            # Re-inserting keeps the least recently used session first
+            self.sessions.pop(token, None)
+            self.sessions[token] = {
+                'medications': current,
+                'pairs': pairs,
+                'version': version,
+                'expires_at': time.monotonic() + self.ttl
+            }
+        
+        return token, current, checker._summarize(interactions)
+    
+    def _expire(self):
+        """Drop expired sessions and the oldest ones above max_sessions"""
+        now = time.monotonic()
+        while self.sessions:
+            token, session = next(iter(self.sessions.items()))
+            if session['expires_at'] > now and len(self.sessions) < self.max_sessions:
+                break
+            del self.sessions[token]
@@ -0,0 +1,148 @@
+"""
+Trigram index for fuzzy name matching
+Narrows the names compared with difflib's similarity ratio to those sharing
+character trigrams with the query, instead of scoring every name
+"""
+
+import heapq
+import numpy as np
+from difflib import SequenceMatcher
+
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to names
+    
+    Trigrams are taken over the UTF-8 bytes of each name padded with spaces,
+    packed into integers and stored as one sorted array of (trigram, name)
+    postings. A query collects the postings of its own trigrams, keeps the
+    names with the largest trigram overlap and scores only those with SequenceMatcher,
+    the same way difflib.get_close_matches does.
+    """
+    
+    def __init__(self, names, max_candidates=500):
+        """
+        Args:
+            names (list): Unique names to index
+            max_candidates (int): Most names scored per query
+        """
+        self.names = list(names)
+        self.max_candidates = max_candidates
+        self.lengths = np.array([len(name) for name in self.names], dtype=np.int32)
+        self.gram_keys, self.gram_offsets, self.postings = self._build(self.names)
+        self.gram_counts = np.bincount(self.postings, minlength=len(self.names))
+    
+    @staticmethod
+    def _pad(name):
+        """Pad a name so short names and word edges still produce trigrams"""
+        return f"  {name} ".encode('utf-8')
+    
+    @staticmethod
+    def _build(names):
+        """
+        Build the postings arrays
+        
+        Returns:
+            tuple: (sorted unique trigram keys, offsets into postings, name ids)
+        """
+        encoded = [TrigramIndex._pad(name) for name in names]
+        if not encoded:
+            return np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32)
+        
+        lengths = np.array([len(value) for value in encoded], dtype=np.int64)
+        pool = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        
+        # Every byte position that starts a trigram inside its own name
+        ends = np.cumsum(lengths)
+        starts_trigram = np.ones(len(pool), dtype=bool)
+        starts_trigram[ends - 1] = False
+        starts_trigram[ends - 2] = False
+        starts = np.flatnonzero(starts_trigram)
+        
+        # One int64 per (trigram, name): the trigram's bytes above the name id.
+        # Built in place, as this is the largest array of the build.
+        pairs = pool[starts].astype(np.int64)
+        pairs <<= 8
+        pairs |= pool[starts + 1]
+        pairs <<= 8
+        pairs |= pool[starts + 2]
+        pairs <<= 32
+        pairs |= np.repeat(np.arange(len(encoded), dtype=np.int32), lengths)[starts]
+        del starts
+        
+        # A name is listed once per distinct trigram
+        pairs.sort()
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+        keys = pairs >> 32
+        gram_starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        gram_keys = keys[gram_starts]
+        gram_offsets = np.append(gram_starts, len(pairs)).astype(np.int64)
+        postings = (pairs & 0xFFFFFFFF).astype(np.int32)
+        return gram_keys, gram_offsets, postings
+    
+    def _query_keys(self, word):
+        """Distinct trigram keys of a query"""
+        data = self._pad(word)
+        return np.unique([(data[i] << 16) | (data[i + 1] << 8) | data[i + 2] for i in range(len(data) - 2)])
+    
+    def candidates(self, word, cutoff=0.6):
+        """
+        Find the names worth scoring against a query
+        
+        Args:
+            word (str): Query
+            cutoff (float): Similarity ratio the caller requires
+            
+        Returns:
+            np.ndarray: Name ids, most trigram overlap first
+        """
+        if len(self.names) == 0:
+            return np.empty(0, dtype=np.int64)
+        
+        keys = self._query_keys(word)
+        found = np.searchsorted(self.gram_keys, keys)
+        indexed = found < len(self.gram_keys)
+        found = found[indexed]
+        found = found[self.gram_keys[found] == keys[indexed]]
+        if len(found) == 0:
+            return np.empty(0, dtype=np.int64)
+        
+        hits = np.concatenate([self.postings[self.gram_offsets[g]:self.gram_offsets[g + 1]] for g in found])
+        shared = np.bincount(hits, minlength=len(self.names))
+        
+        # ratio = 2 * matches / total length, and matches <= the shorter length
+        size = len(word)
+        fits = 2 * np.minimum(self.lengths, size) >= cutoff * (self.lengths + size)
+        ids = np.flatnonzero((shared > 0) & fits)
+        
+        # Dice coefficient of the trigram sets, so long names are not favoured
+        overlap = shared[ids] / (self.gram_counts[ids] + len(keys))
+        if len(ids) > self.max_candidates:
+            best = np.argpartition(-overlap, self.max_candidates - 1)[:self.max_candidates]
+            ids, overlap = ids[best], overlap[best]
+        return ids[np.argsort(-overlap, kind='stable')]
+    
+    def get_close_matches(self, word, n=3, cutoff=0.6):
+        """
+        Drop-in replacement for difflib.get_close_matches over the indexed names
+        
+        Args:
+            word (str): Query
+            n (int): Maximum number of matches
+            cutoff (float): Minimum similarity ratio in [0, 1]
+            
+        Returns:
+            list: Best matching names, most similar first
+        """
+        if n <= 0:
+            return []
+        
+        result = []
+        s = SequenceMatcher()
+        s.set_seq2(word)
+        for name_id in self.candidates(word, cutoff).tolist():
+            name = self.names[name_id]
+            s.set_seq1(name)
+            if s.real_quick_ratio() >= cutoff and s.quick_ratio() >= cutoff and s.ratio() >= cutoff:
+                result.append((s.ratio(), name))
+        
+        return [name for score, name in heapq.nlargest(n, result)]
@@ -0,0 +1,226 @@
+"""
+Hot reloading for dataset-backed components
+Rebuilds a component in a background thread and swaps it in atomically,
+so requests keep being served from the old instance until the new one is ready
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from utils.binary_snapshot import source_signature
+
+class ComponentNotReady(RuntimeError):
+    """Raised when a component is used before its first build has finished"""
+
+class HotReloader:
+    """
+    Holds the live instance of a component and rebuilds it on demand
+    
+    Attribute access is forwarded to the live instance, so the holder can be
+    used in place of the component. A method call resolves the instance once
+    and runs entirely against it; a reload only replaces the reference after
+    the new instance is fully built, so readers never see a half-built state.
+    
+    With background=True the first build also runs in a thread; until it
+    finishes the component is not ready and using it raises ComponentNotReady.
+    """
+    
+    def __init__(self, name, factory, watch_paths, validate=None, on_swap=None,
+                 requires=(), background=False):
+        """
+        Args:
+            name (str): Component name used in logs and status
+            factory (callable): Builds and returns a fully loaded instance
+            watch_paths (list): Source files whose changes trigger a reload
+            validate (callable): Checks a reloaded instance before it is swapped in
+            on_swap (callable): Called with the new instance after each reload
+            requires (list): Components whose first build must finish before this one builds
+            background (bool): Build the first instance in a background thread
+        """
+        self.name = name
+        self.factory = factory
+        self.watch_paths = watch_paths
+        self.validate = validate
+        self.on_swap = on_swap
+        self.requires = list(requires)
+        self.generation = 0
+        self.state = 'loading'
+        self.last_reload = None
+        self._reload_thread = None
+        self._watch_thread = None
+        self._state_lock = threading.Lock()
+        # Builds of one component never overlap; different components build
+        # concurrently, so a slow build does not hold up the others
+        self._build_lock = threading.Lock()
+        self._settled = threading.Event()
+        
+        self._signatures = self._read_signatures()
+        if background:
+            self.reload(trigger='startup')
+        else:
+            self._build('startup')
+    
+    def __getattr__(self, attr):
+        # Only called for attributes the holder itself does not have
+        try:
+            current = self.__dict__['current']
+        except KeyError:
+            raise ComponentNotReady(f"{self.__dict__.get('name', 'component')} is still loading") from None
+        return getattr(current, attr)
+    
+    @property
+    def ready(self):
+        """True once an instance has been built"""
+        return 'current' in self.__dict__
+    
+    def wait_ready(self, timeout=None):
+        """
+        Block until the first build has finished, successfully or not
+        
+        Args:
+            timeout (float): Seconds to wait, or None to wait indefinitely
+            
+        Returns:
+            bool: True if the component is ready
+        """
+        self._settled.wait(timeout)
+        return self.ready
+    
+    def reload(self, trigger='manual', wait=False):
+        """
+        Rebuild the component in a background thread
+        
+        Args:
+            trigger (str): Why the reload was requested, kept in the status
+            wait (bool): Block until the rebuild has finished. A rebuild that is
+                already running may have read the sources before they changed,
+                so it is waited for first and a new one is started after it.
+            
+        Returns:
+            bool: True if a rebuild was started, False if one is already running and wait is False
+        """
+        while True:
+            with self._state_lock:
+                running = self._reload_thread
+                if running is None or not running.is_alive():
+                    thread = threading.Thread(
+                        target=self._reload, args=(trigger,), name=f'reload-{self.name}', daemon=True
+                    )
+                    self._reload_thread = thread
+                    thread.start()
+                    break
+                if not wait:
+                    return False
+            running.join()
+        
+        if wait:
+            thread.join()
+        return True
+    
+    def watch(self, interval=30):
+        """
+        Poll the watched files and reload when their size or mtime changes
+        
+        Args:
+            interval (float): Seconds between checks
+        """
+        if self._watch_thread is not None:
+            return
+        
+        def poll():
+            while True:
+                time.sleep(interval)
+                if self._read_signatures() != self._signatures:
+                    self.reload(trigger='file change')
+        
+        self._watch_thread = threading.Thread(target=poll, name=f'watch-{self.name}', daemon=True)
+        self._watch_thread.start()
+    
+    def status(self):
+        """
+        Get the reload state of the component
+        
+        Returns:
+            dict: Load state, generation, whether a rebuild is running and the last rebuild report
+        """
+        return {
+            'component': self.name,
+            'state': self.state,
+            'generation': self.generation,
+            'reloading': self._reload_thread is not None and self._reload_thread.is_alive(),
+            'last_reload': self.last_reload
+        }
+    
+    def _reload(self, trigger):
+        """Build a new instance and swap it in"""
+        # Remember what was attempted so a broken file is not retried every poll
+        self._signatures = self._read_signatures()
+        try:
+            instance = self._build(trigger)
+        except Exception as e:
+            print(f"Error reloading {self.name}: {e}")
+            return
+        
+        # Dependents build against the startup instance themselves
+        if self.on_swap is not None and trigger != 'startup':
+            self.on_swap(instance)
+    
+    def _build(self, trigger):
+        """
+        Build an instance with the factory, swap it in and report on the build
+        
+        Args:
+            trigger (str): Why the build was requested
+            
+        Returns:
+            object: The new live instance
+        """
+        # Waiting happens outside the build lock
+        for dependency in self.requires:
+            dependency.wait_ready()
+        
+        report = {
+            'trigger': trigger,
+            'started_at': datetime.now().isoformat(),
+            'success': False
+        }
+        start = time.perf_counter()
+        
+        try:
+            with self._build_lock:
+                instance = self.factory()
+            # A broken source file must not replace a working instance
+            if self.generation > 0 and self.validate is not None and not self.validate(instance):
+                raise ValueError('rebuilt instance failed validation')
+        except Exception as e:
+            report['error'] = str(e)
+            report['build_seconds'] = round(time.perf_counter() - start, 3)
+            self.last_reload = report
+            if not self.ready:
+                self.state = 'failed'
+                self._settled.set()
+            raise
+        
+        report['build_seconds'] = round(time.perf_counter() - start, 3)
+        report['memory_bytes'] = int(instance.memory_usage()) if hasattr(instance, 'memory_usage') else None
+        report['success'] = True
+        
+        # Single reference swap: calls already running keep the old instance
+        self.current = instance
+        self.generation += 1
+        report['generation'] = self.generation
+        self.last_reload = report
+        self.state = 'ready'
+        self._settled.set()
+        
+        memory = f", {report['memory_bytes'] / 1024 / 1024:.1f} MB" if report['memory_bytes'] is not None else ''
+        print(f"Built {self.name} in {report['build_seconds']:.2f}s{memory} ({trigger})")
+        return instance
+    
+    def _read_signatures(self):
+        """Current size and mtime of every watched file"""
+        return {
+            path: source_signature(path) if os.path.exists(path) else None
+            for path in self.watch_paths
+        }
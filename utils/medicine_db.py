@@ -1,31 +1,77 @@
 import pandas as pd
+import numpy as np
+import heapq
 import os
-from difflib import get_close_matches
+import re
+import sys
+import time
+from bisect import bisect_left
+from itertools import islice
+from utils.binary_snapshot import (
+    source_signature, encode_strings, decode_strings, write_snapshot, read_snapshot
+)
+from utils.fuzzy_index import TrigramIndex
 
 class MedicineDatabase:
     """
     Handler for medicine dataset with search and information retrieval
     """
     
-    def __init__(self, db_path='use_dataset/medicine_dataset.csv'):
+    # Wide, mostly empty column groups packed into per-medicine lists at load
+    LIST_COLUMNS = {
+        'substitutes': ('substitute', 5),
+        'side_effects': ('sideEffect', 42),
+        'uses': ('use', 5)
+    }
+    
+    # Packed list fields that can be searched by value
+    REVERSE_INDEXED = ['side_effects', 'uses']
+    
+    # The only other columns the API reads; class columns are low-cardinality
+    COLUMNS = ['id', 'name', 'Chemical Class', 'Habit Forming', 'Therapeutic Class', 'Action Class']
+    CATEGORY_COLUMNS = ['Chemical Class', 'Habit Forming', 'Therapeutic Class', 'Action Class']
+    
+    # Class columns that are searched by class
+    CLASS_INDEXED = ['Therapeutic Class']
+    
+    # Bump whenever the layout of the snapshot changes
+    SNAPSHOT_VERSION = 1
+    
+    def __init__(self, db_path='use_dataset/medicine_dataset.csv', snapshot_path=None):
         self.db_path = db_path
+        self.snapshot_path = snapshot_path or os.path.splitext(db_path)[0] + '.snapshot'
         self.medicines_db = None
         self.medicine_names = []
+        self.name_rows = {}
+        self.packed_lists = {}
+        self.class_rows = {}
+        self.statistics = {}
+        self.unique_names = []
+        self.sorted_names = []
+        self.sorted_ranks = np.empty(0, dtype=np.int64)
+        self.fuzzy_index = TrigramIndex([])
         self.load_database()
     
     def load_database(self):
-        """Load the medicine database"""
+        """Load the medicine database, from its snapshot when it is current"""
         try:
             if os.path.exists(self.db_path):
-                # Read with chunksize due to large file
-                chunks = []
-                for chunk in pd.read_csv(self.db_path, chunksize=10000, low_memory=False):
-                    chunks.append(chunk)
-                self.medicines_db = pd.concat(chunks, ignore_index=True)
+                start = time.perf_counter()
+                source = 'snapshot'
+                if not self._load_snapshot():
+                    source = 'CSV'
+                    self._load_csv()
+                    self._save_snapshot()
                 
                 # Extract medicine names for autocomplete
                 self.medicine_names = self.medicines_db['name'].dropna().str.lower().tolist()
-                print(f"Loaded {len(self.medicines_db)} medicines from database")
+                self._build_name_index()
+                self._build_row_index()
+                self._build_class_index()
+                self._build_reverse_indexes()
+                self._compute_statistics()
+                print(f"Loaded {len(self.medicines_db)} medicines from {source} "
+                      f"in {time.perf_counter() - start:.2f}s")
             else:
                 print(f"Warning: Medicine database not found at {self.db_path}")
                 self.medicines_db = pd.DataFrame()
@@ -33,6 +79,292 @@ class MedicineDatabase:
             print(f"Error loading medicine database: {e}")
             self.medicines_db = pd.DataFrame()
     
+    def _load_csv(self):
+        """
+        Parse the medicine CSV, keeping only the columns the API reads
+        
+        The file is read in chunks and each chunk's list columns are packed
+        right away, so the wide columns are never held for the whole dataset.
+        """
+        needed = set(self.COLUMNS)
+        for prefix, count in self.LIST_COLUMNS.values():
+            needed.update(f'{prefix}{i}' for i in range(count))
+        
+        frames = []
+        list_parts = {field: [] for field in self.LIST_COLUMNS}
+        for chunk in pd.read_csv(self.db_path, chunksize=10000, usecols=lambda column: column in needed,
+                                 low_memory=False):
+            for field, (prefix, count) in self.LIST_COLUMNS.items():
+                list_parts[field].append(self._list_cells(chunk, prefix, count))
+            frames.append(chunk[[column for column in self.COLUMNS if column in chunk.columns]])
+        
+        self.medicines_db = pd.concat(frames, ignore_index=True)
+        for column in self.CATEGORY_COLUMNS:
+            if column in self.medicines_db.columns:
+                self.medicines_db[column] = self.medicines_db[column].astype('category')
+        self.packed_lists = {field: self._pack_list(parts) for field, parts in list_parts.items()}
+    
+    def _load_snapshot(self):
+        """
+        Memory-map the snapshot if it was built from the current CSV
+        
+        Returns:
+            bool: True if the snapshot was loaded
+        """
+        if not os.path.exists(self.snapshot_path):
+            return False
+        
+        try:
+            metadata, arrays = read_snapshot(self.snapshot_path)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable medicine snapshot: {e}")
+            return False
+        
+        if (metadata.get('version') != self.SNAPSHOT_VERSION or
+                metadata.get('source') != source_signature(self.db_path)):
+            return False
+        
+        columns = {}
+        for column, kind in metadata['columns']:
+            if kind == 'values':
+                columns[column] = np.array(arrays[f'{column}/values'])
+                continue
+            pool = decode_strings(arrays[f'{column}/offsets'], arrays[f'{column}/pool'])
+            if kind == 'category':
+                columns[column] = pd.Categorical.from_codes(np.array(arrays[f'{column}/codes']), categories=pool)
+            else:
+                # Code -1 (missing value) picks up the trailing NaN
+                columns[column] = np.array(pool + [np.nan], dtype=object)[arrays[f'{column}/codes']]
+        self.medicines_db = pd.DataFrame(columns)
+        
+        self.packed_lists = {}
+        for field in self.LIST_COLUMNS:
+            self.packed_lists[field] = {
+                'offsets': arrays[f'{field}/offsets'],
+                'ids': arrays[f'{field}/ids'],
+                'values': decode_strings(arrays[f'{field}/value_offsets'], arrays[f'{field}/value_pool'])
+            }
+        return True
+    
+    def _save_snapshot(self):
+        """
+        Write the loaded dataset to the snapshot file for the next start
+        
+        String columns are stored as codes into a string pool; class columns
+        come back as categoricals, other string columns as plain objects.
+        """
+        arrays = {}
+        columns = []
+        try:
+            for column in self.medicines_db.columns:
+                values = self.medicines_db[column]
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    kind, codes, pool = 'category', values.cat.codes.to_numpy(), list(values.cat.categories)
+                elif pd.api.types.is_numeric_dtype(values.dtype):
+                    kind = 'values'
+                    arrays[f'{column}/values'] = values.to_numpy()
+                else:
+                    kind = 'strings'
+                    codes, pool = pd.factorize(values)
+                    pool = list(pool)
+                if kind != 'values':
+                    arrays[f'{column}/codes'] = codes.astype(np.int32)
+                    arrays[f'{column}/offsets'], arrays[f'{column}/pool'] = encode_strings(pool)
+                columns.append([column, kind])
+            
+            for field, packed in self.packed_lists.items():
+                arrays[f'{field}/offsets'] = packed['offsets']
+                arrays[f'{field}/ids'] = packed['ids']
+                arrays[f'{field}/value_offsets'], arrays[f'{field}/value_pool'] = encode_strings(packed['values'])
+            
+            metadata = {
+                'version': self.SNAPSHOT_VERSION,
+                'source': source_signature(self.db_path),
+                'columns': columns
+            }
+            write_snapshot(self.snapshot_path, arrays, metadata)
+        except (OSError, AttributeError, TypeError) as e:
+            # AttributeError/TypeError: a value that is not a string cannot be pooled
+            print(f"Warning: Could not write medicine snapshot: {e}")
+    
+    @staticmethod
+    def _list_cells(chunk, prefix, count):
+        """
+        Collect the non-empty cells of one group of list columns
+        
+        Args:
+            chunk (pd.DataFrame): Rows of the dataset
+            prefix (str): Column name prefix, e.g. 'sideEffect'
+            count (int): Number of numbered columns in the group
+            
+        Returns:
+            tuple: (number of values per row, values in row then column order)
+        """
+        columns = [f'{prefix}{i}' for i in range(count) if f'{prefix}{i}' in chunk.columns]
+        cells = chunk[columns].to_numpy(dtype=object)
+        present = pd.notna(cells) & (cells != '')
+        return present.sum(axis=1), cells[present]
+    
+    @staticmethod
+    def _pack_list(parts):
+        """
+        Build a ragged array from the cells collected per chunk
+        
+        The result is an offsets array (one entry per row, plus one) and ids
+        into a pool of distinct values, so a row's list is a slice.
+        
+        Args:
+            parts (list): (counts, values) tuples from _list_cells
+            
+        Returns:
+            dict: offsets, ids and values
+        """
+        counts = np.concatenate([part[0] for part in parts])
+        ids, values = pd.factorize(np.concatenate([part[1] for part in parts]))
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return {'offsets': offsets, 'ids': ids.astype(np.int32), 'values': list(values)}
+    
+    def row_list(self, field, position):
+        """
+        Get one row's values of a packed list field
+        
+        Args:
+            field (str): 'substitutes', 'side_effects' or 'uses'
+            position (int): Row position in medicines_db
+            
+        Returns:
+            list: Non-empty values in column order
+        """
+        packed = self.packed_lists.get(field)
+        if packed is None:
+            return []
+        offsets, values = packed['offsets'], packed['values']
+        return [values[i] for i in packed['ids'][offsets[position]:offsets[position + 1]].tolist()]
+    
+    def _build_name_index(self):
+        """
+        Build the sorted prefix index and the trigram index over medicine names
+        
+        Names are deduplicated in order of first appearance; that rank is kept
+        alongside the alphabetically sorted names, so a prefix range found by
+        bisection can be put back into dataset order.
+        """
+        _, uniques = pd.factorize(pd.Series(self.medicine_names, dtype=object))
+        self.unique_names = list(uniques)
+        order = np.argsort(np.asarray(uniques, dtype=object), kind='stable')
+        self.sorted_names = [self.unique_names[i] for i in order]
+        self.sorted_ranks = order.astype(np.int64)
+        self.fuzzy_index = TrigramIndex(self.unique_names)
+    
+    def _build_row_index(self):
+        """Map each lowercased name to the position of its first row"""
+        self.name_rows = {}
+        for position, name in enumerate(self.medicines_db['name'].tolist()):
+            if isinstance(name, str):
+                self.name_rows.setdefault(name.lower(), position)
+    
+    def _build_class_index(self):
+        """
+        Map each class of the searched class columns to its row positions
+        
+        Per column, the rows are grouped by category code: the rows of
+        category i are rows[offsets[i]:offsets[i + 1]], in dataset order.
+        """
+        self.class_rows = {}
+        for column in self.CLASS_INDEXED:
+            if column not in self.medicines_db.columns:
+                continue
+            classes = self.medicines_db[column].astype('category')
+            codes = classes.cat.codes.to_numpy()
+            order = np.argsort(codes, kind='stable')
+            
+            offsets = np.zeros(len(classes.cat.categories) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(codes[codes >= 0], minlength=len(classes.cat.categories)), out=offsets[1:])
+            
+            self.class_rows[column] = {
+                'categories': [str(category) for category in classes.cat.categories],
+                'offsets': offsets,
+                # Rows with no class (code -1) sort first and are left out
+                'rows': order[(codes < 0).sum():]
+            }
+    
+    def _build_reverse_indexes(self):
+        """
+        Map each side effect and use to the rows that list it
+        
+        Stored next to the packed list: the rows listing value i are
+        value_rows[value_offsets[i]:value_offsets[i + 1]], each row once and
+        in dataset order.
+        """
+        for field in self.REVERSE_INDEXED:
+            packed = self.packed_lists[field]
+            row_count = len(packed['offsets']) - 1
+            stride = max(row_count, 1)
+            rows = np.repeat(np.arange(row_count, dtype=np.int64), np.diff(packed['offsets']))
+            
+            # Sorting value * stride + row groups by value, then row; drop repeats
+            keys = np.unique(packed['ids'].astype(np.int64) * stride + rows)
+            
+            value_offsets = np.zeros(len(packed['values']) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys // stride, minlength=len(packed['values'])), out=value_offsets[1:])
+            
+            packed['value_rows'] = (keys % stride).astype(np.int32)
+            packed['value_offsets'] = value_offsets
+            packed['values_lower'] = [str(value).lower() for value in packed['values']]
+    
+    def _compute_statistics(self):
+        """Compute the dataset statistics once per load"""
+        def distinct(column):
+            return int(self.medicines_db[column].nunique()) if column in self.medicines_db.columns else 0
+        
+        habit_forming = self.medicines_db.get('Habit Forming')
+        self.statistics = {
+            'total_medicines': len(self.medicines_db),
+            'therapeutic_classes': distinct('Therapeutic Class'),
+            'habit_forming_count': int((habit_forming == 'Yes').sum()) if habit_forming is not None else 0,
+            'chemical_classes': distinct('Chemical Class')
+        }
+    
+    def _prefix_matches(self, prefix, limit):
+        """
+        Find names starting with a prefix, in dataset order
+        
+        Args:
+            prefix (str): Lowercased prefix
+            limit (int): Maximum number of results
+            
+        Returns:
+            list: Unique matching names
+        """
+        start = bisect_left(self.sorted_names, prefix)
+        if prefix:
+            # Smallest string greater than every string with this prefix
+            end = bisect_left(self.sorted_names, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        else:
+            end = len(self.sorted_names)
+        
+        ranks = self.sorted_ranks[start:end]
+        if 0 < limit < len(ranks):
+            ranks = np.partition(ranks, limit - 1)[:limit]
+        return [self.unique_names[rank] for rank in np.sort(ranks).tolist()]
+    
+    def memory_usage(self):
+        """
+        Approximate memory held by the loaded dataset
+        
+        Returns:
+            int: Size in bytes
+        """
+        size = int(self.medicines_db.memory_usage(deep=True).sum()) if self.medicines_db is not None else 0
+        size += sys.getsizeof(self.medicine_names) + sum(sys.getsizeof(name) for name in self.medicine_names)
+        for packed in self.packed_lists.values():
+            size += sum(array.nbytes for array in packed.values() if isinstance(array, np.ndarray))
+            size += sys.getsizeof(packed['values']) + sum(sys.getsizeof(value) for value in packed['values'])
+        size += sys.getsizeof(self.name_rows) + sys.getsizeof(self.unique_names) + sys.getsizeof(self.sorted_names) + self.sorted_ranks.nbytes
+        size += self.fuzzy_index.postings.nbytes + self.fuzzy_index.gram_keys.nbytes + self.fuzzy_index.gram_offsets.nbytes
+        return size
+    
     def search_medicine(self, query, limit=10):
         """
         Search for medicines by name
@@ -50,11 +382,11 @@ class MedicineDatabase:
         query_lower = query.lower().strip()
         
         # Exact and partial matches
-        exact_matches = [name for name in self.medicine_names if name.startswith(query_lower)]
+        exact_matches = self._prefix_matches(query_lower, limit)
         
         # If not enough exact matches, use fuzzy matching
         if len(exact_matches) < limit:
-            fuzzy_matches = get_close_matches(query_lower, self.medicine_names, n=limit, cutoff=0.6)
+            fuzzy_matches = self.fuzzy_index.get_close_matches(query_lower, n=limit, cutoff=0.6)
             # Combine and remove duplicates
             matches = list(dict.fromkeys(exact_matches + fuzzy_matches))
         else:
@@ -77,48 +409,52 @@ class MedicineDatabase:
         
         medicine_lower = medicine_name.lower().strip()
         
-        # Search for the medicine
-        medicine_row = self.medicines_db[
-            self.medicines_db['name'].str.lower() == medicine_lower
-        ]
-        
-        if medicine_row.empty:
+        # Duplicate names resolve to their first row
+        position = self.name_rows.get(medicine_lower)
+        if position is None:
             return None
         
-        medicine_data = medicine_row.iloc[0]
-        
-        # Extract substitutes
-        substitutes = []
-        for i in range(5):
-            sub = medicine_data.get(f'substitute{i}')
-            if pd.notna(sub) and sub != '':
-                substitutes.append(sub)
-        
-        # Extract side effects
-        side_effects = []
-        for i in range(42):
-            effect = medicine_data.get(f'sideEffect{i}')
-            if pd.notna(effect) and effect != '':
-                side_effects.append(effect)
-        
-        # Extract uses
-        uses = []
-        for i in range(5):
-            use = medicine_data.get(f'use{i}')
-            if pd.notna(use) and use != '':
-                uses.append(use)
+        return self._format_medicines([position])[0]
+    
+    def _format_medicines(self, positions):
+        """
+        Build medicine info dicts for several rows at once
         
-        return {
-            'id': int(medicine_data.get('id', 0)) if pd.notna(medicine_data.get('id')) else 0,
-            'name': medicine_data.get('name', ''),
-            'substitutes': substitutes,
-            'side_effects': side_effects,
-            'uses': uses,
-            'chemical_class': medicine_data.get('Chemical Class', 'N/A'),
-            'habit_forming': medicine_data.get('Habit Forming', 'No'),
-            'therapeutic_class': medicine_data.get('Therapeutic Class', 'N/A'),
-            'action_class': medicine_data.get('Action Class', 'N/A')
-        }
+        Each column is read once for all rows rather than row by row.
+        
+        Args:
+            positions (list): Row positions in medicines_db
+            
+        Returns:
+            list: Medicine info dicts, in the order of positions
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        
+        def column(name, default):
+            if name not in self.medicines_db.columns:
+                return [default] * len(positions)
+            return self.medicines_db[name].array[positions].tolist()
+        
+        columns = zip(
+            positions.tolist(), column('id', None), column('name', ''),
+            column('Chemical Class', 'N/A'), column('Habit Forming', 'No'),
+            column('Therapeutic Class', 'N/A'), column('Action Class', 'N/A')
+        )
+        
+        medicines = []
+        for position, medicine_id, name, chemical_class, habit_forming, therapeutic_class, action_class in columns:
+            medicines.append({
+                'id': int(medicine_id) if pd.notna(medicine_id) else 0,
+                'name': name,
+                'substitutes': self.row_list('substitutes', position),
+                'side_effects': self.row_list('side_effects', position),
+                'uses': self.row_list('uses', position),
+                'chemical_class': chemical_class,
+                'habit_forming': habit_forming,
+                'therapeutic_class': therapeutic_class,
+                'action_class': action_class
+            })
+        return medicines
     
     def get_medicine_side_effects(self, medicine_name):
         """
@@ -160,12 +496,18 @@ class MedicineDatabase:
         Returns:
             dict: Dictionary mapping medicine names to their info
         """
-        results = {}
+        if self.medicines_db is None or len(self.medicines_db) == 0:
+            return {}
+        
+        # One index probe per distinct name, then one pass over the columns
+        found = {}
         for medicine in medicine_list:
-            info = self.get_medicine_info(medicine)
-            if info:
-                results[medicine] = info
-        return results
+            if medicine not in found:
+                found[medicine] = self.name_rows.get(medicine.lower().strip())
+        found = {medicine: position for medicine, position in found.items() if position is not None}
+        
+        infos = self._format_medicines(list(found.values()))
+        return dict(zip(found, infos))
     
     def get_medicines_by_therapeutic_class(self, therapeutic_class, limit=20):
         """
@@ -181,13 +523,110 @@ class MedicineDatabase:
         if self.medicines_db is None or len(self.medicines_db) == 0:
             return []
         
-        matches = self.medicines_db[
-            self.medicines_db['Therapeutic Class'].str.contains(
-                therapeutic_class, case=False, na=False
-            )
-        ]
+        index = self.class_rows.get('Therapeutic Class')
+        if index is None:
+            return []
+        offsets, rows = index['offsets'], index['rows']
+        
+        # Match the query against the distinct classes, not every row
+        pattern = re.compile(therapeutic_class, re.IGNORECASE)
+        matched = [i for i, category in enumerate(index['categories']) if pattern.search(category)]
+        
+        # Each class's rows are in dataset order; merge them and keep the first ones
+        positions = list(islice(heapq.merge(*(rows[offsets[i]:offsets[i + 1]] for i in matched)), max(limit, 0)))
+        return self.medicines_db['name'].array[np.array(positions, dtype=np.intp)].tolist()
+    
+    def find_by_side_effects(self, terms, match='any', offset=0, limit=50):
+        """
+        Find medicines that list the given side effects
+        
+        Args:
+            terms (list): Side effects, matched case-insensitively as substrings
+            match (str): 'any' ranks partial matches after full ones, 'all' keeps full ones only
+            offset (int): Number of matching medicines to skip
+            limit (int): Maximum number of medicines to return
+            
+        Returns:
+            dict: Page of medicines, most matched terms first
+        """
+        return self._find_by_terms('side_effects', terms, match, offset, limit)
+    
+    def find_by_uses(self, terms, match='any', offset=0, limit=50):
+        """
+        Find medicines that list the given uses
         
-        return matches['name'].head(limit).tolist()
+        Args:
+            terms (list): Uses, matched case-insensitively as substrings
+            match (str): 'any' ranks partial matches after full ones, 'all' keeps full ones only
+            offset (int): Number of matching medicines to skip
+            limit (int): Maximum number of medicines to return
+            
+        Returns:
+            dict: Page of medicines, most matched terms first
+        """
+        return self._find_by_terms('uses', terms, match, offset, limit)
+    
+    def _find_by_terms(self, field, terms, match, offset, limit):
+        """
+        Rank the rows listing any of several terms in a reverse indexed field
+        
+        Returns:
+            dict: Page of medicines with the total number of matches
+        """
+        if match not in ('any', 'all'):
+            raise ValueError(f"Unknown match mode: {match}")
+        terms = list(dict.fromkeys(term.lower().strip() for term in terms if term.strip()))
+        if not terms:
+            raise ValueError('No search terms given')
+        offset = max(0, int(offset))
+        limit = max(0, int(limit))
+        
+        if self.medicines_db is None or len(self.medicines_db) == 0:
+            return {'terms': terms, 'match': match, 'total': 0, 'offset': offset, 'limit': limit, 'medicines': []}
+        
+        packed = self.packed_lists.get(field)
+        term_rows = []
+        if packed is not None and 'value_rows' in packed:
+            value_offsets, value_rows = packed['value_offsets'], packed['value_rows']
+            for term in terms:
+                # Terms are matched against the distinct values, not every row
+                matched = [i for i, value in enumerate(packed['values_lower']) if term in value]
+                rows = [value_rows[value_offsets[i]:value_offsets[i + 1]] for i in matched]
+                term_rows.append(np.unique(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int32))
+        
+        if term_rows:
+            rows, hits = np.unique(np.concatenate(term_rows), return_counts=True)
+        else:
+            rows, hits = np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        if match == 'all':
+            rows, hits = rows[hits == len(terms)], hits[hits == len(terms)]
+        
+        # Most matched terms first, then dataset order
+        order = np.lexsort((rows, -hits))
+        page = rows[order[offset:offset + limit]]
+        
+        # Which terms each row of the page matched
+        page_matches = [np.isin(page, found) for found in term_rows]
+        
+        ids = self.medicines_db['id'].array if 'id' in self.medicines_db.columns else None
+        names = self.medicines_db['name'].array
+        medicines = []
+        for i, row in enumerate(page.tolist()):
+            medicine_id = ids[row] if ids is not None else None
+            medicines.append({
+                'id': int(medicine_id) if pd.notna(medicine_id) else 0,
+                'name': names[row],
+                'matched_terms': [term for term, found in zip(terms, page_matches) if found[i]]
+            })
+        
+        return {
+            'terms': terms,
+            'match': match,
+            'total': len(rows),
+            'offset': offset,
+            'limit': limit,
+            'medicines': medicines
+        }
     
     def check_habit_forming(self, medicine_name):
         """
@@ -214,9 +653,4 @@ class MedicineDatabase:
         if self.medicines_db is None or len(self.medicines_db) == 0:
             return {}
         
-        return {
-            'total_medicines': len(self.medicines_db),
-            'therapeutic_classes': self.medicines_db['Therapeutic Class'].nunique(),
-            'habit_forming_count': (self.medicines_db['Habit Forming'] == 'Yes').sum(),
-            'chemical_classes': self.medicines_db['Chemical Class'].nunique()
-        }
+        return dict(self.statistics)
@@ -0,0 +1,156 @@
+"""
+Micro-batching for concurrent single-item requests
+Collects items submitted by concurrent callers for a few milliseconds and
+processes them with one batched call, so fixed per-call costs are paid once
+per batch instead of once per request
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+class QueueFull(RuntimeError):
+    """Raised when too many items are already waiting to be processed"""
+
+class MicroBatcher:
+    """
+    Runs a batch function over items submitted one at a time
+    
+    A single worker thread takes the oldest waiting item, then keeps
+    collecting items until the batch is full or the oldest item has waited
+    max_wait_ms. Each caller blocks until its own result is ready. If a batch
+    fails, its items are retried one by one so a bad item only fails its own
+    caller.
+    """
+    
+    def __init__(self, name, process, max_batch_size=32, max_wait_ms=2.0, max_queue_depth=1000):
+        """
+        Args:
+            name (str): Name used for the worker thread and in stats
+            process (callable): Takes a list of items, returns a list of results in the same order
+            max_batch_size (int): Most items processed in one call
+            max_wait_ms (float): Longest an item waits for others to join its batch
+            max_queue_depth (int): Most items waiting at once; further submits raise QueueFull
+        """
+        self.name = name
+        self.process = process
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self.max_queue_depth = max_queue_depth
+        self._queue = queue.Queue(maxsize=max_queue_depth)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+        self._rejected = 0
+        self._failed_batches = 0
+        self._peak_queue_depth = 0
+        self._queue_wait_seconds = 0.0
+        self._max_queue_wait_seconds = 0.0
+    
+    def submit(self, item, timeout=None):
+        """
+        Process one item as part of the next batch
+        
+        Args:
+            item: Item passed to the batch function
+            timeout (float): Seconds to wait for the result, or None to wait indefinitely
+            
+        Returns:
+            The batch function's result for this item
+            
+        Raises:
+            QueueFull: If max_queue_depth items are already waiting
+        """
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            raise QueueFull(f"{self.name} queue is full ({self.max_queue_depth} waiting)") from None
+        
+        with self._stats_lock:
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queue.qsize())
+        self._start_worker()
+        return future.result(timeout)
+    
+    def stats(self):
+        """
+        Get batching settings and counters
+        
+        Returns:
+            dict: Configuration, current queue depth and batch/wait statistics
+        """
+        with self._stats_lock:
+            return {
+                'name': self.name,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait_ms,
+                'max_queue_depth': self.max_queue_depth,
+                'queue_depth': self._queue.qsize(),
+                'peak_queue_depth': self._peak_queue_depth,
+                'batches': self._batches,
+                'items': self._items,
+                'mean_batch_size': round(self._items / self._batches, 2) if self._batches else 0,
+                'largest_batch': self._largest_batch,
+                'failed_batches': self._failed_batches,
+                'rejected': self._rejected,
+                'mean_queue_wait_ms': round(self._queue_wait_seconds / self._items * 1000, 3) if self._items else 0,
+                'max_queue_wait_ms': round(self._max_queue_wait_seconds * 1000, 3)
+            }
+    
+    def _start_worker(self):
+        """Start the worker thread on first use"""
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=f'batch-{self.name}', daemon=True)
+                self._worker.start()
+    
+    def _run(self):
+        """Collect and process batches forever"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = batch[0][2] + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                # Past the deadline, only take what is already waiting
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            started = time.perf_counter()
+            waits = [started - submitted for _, _, submitted in batch]
+            with self._stats_lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._largest_batch = max(self._largest_batch, len(batch))
+                self._queue_wait_seconds += sum(waits)
+                self._max_queue_wait_seconds = max(self._max_queue_wait_seconds, max(waits))
+            
+            self._process(batch)
+    
+    def _process(self, batch):
+        """Run the batch function and hand each caller its result"""
+        try:
+            results = self.process([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"{self.name} returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            with self._stats_lock:
+                self._failed_batches += 1
+            for entry in batch:
+                self._process([entry])
+            return
+        
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,224 @@
+"""
+Name resolution between the medicine dataset and the interactions database
+Maps brand names (as picked from MedicineDatabase) to the generic names the
+drug interactions database is keyed on
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from utils.binary_snapshot import (
+    source_signature, encode_strings, decode_strings, write_snapshot, read_snapshot
+)
+
+class DrugNameResolver:
+    """
+    Resolves any medicine name to interaction database drug names
+    
+    The alias map is built once from the medicine dataset: a medicine whose
+    own name does not match a known drug borrows the match of the medicines
+    it lists as substitutes (same composition). Chemical class is not used, as
+    medicines sharing a class name can have unrelated interactions. An
+    optional alias file (CSV with alias and generic columns) overrides both.
+    The map is cached to disk and reused while its sources are unchanged.
+    """
+    
+    # Bump whenever the resolution rules change
+    CACHE_VERSION = 2
+    
+    def __init__(self, medicine_db, interaction_checker,
+                 alias_path='use_dataset/drug_aliases.csv',
+                 cache_path='use_dataset/name_aliases.snapshot'):
+        self.medicine_db = medicine_db
+        self.interaction_checker = interaction_checker
+        self.alias_path = alias_path
+        self.cache_path = cache_path
+        self.aliases = {}
+        self.load()
+    
+    def load(self):
+        """Load the alias map from the cache, or build and cache it"""
+        try:
+            if not self._load_cache():
+                self.aliases = self._build_aliases()
+                self._save_cache()
+            print(f"Resolved {len(self.aliases)} medicine names to interaction drugs")
+        except Exception as e:
+            print(f"Error building medicine name aliases: {e}")
+            self.aliases = {}
+    
+    def resolve(self, name):
+        """
+        Get the interaction database names for a medicine name
+        
+        Args:
+            name (str): Medicine name, brand or generic
+            
+        Returns:
+            tuple: Matching interaction drug names, best match first
+        """
+        name = name.lower().strip()
+        generics = self.aliases.get(name)
+        if generics is None:
+            generics = self._match_name(name)
+        return generics
+    
+    def _match_name(self, name):
+        """
+        Match a name against the interaction drugs directly
+        
+        Dataset names carry strength and form ("aspirin 75mg tablet"), so
+        shorter word prefixes of the name are tried as well.
+        """
+        known = self.interaction_checker.drug_ids
+        if name in known:
+            return (name,)
+        
+        words = name.split()
+        for length in range(len(words) - 1, 0, -1):
+            prefix = ' '.join(words[:length])
+            if prefix in known:
+                return (prefix,)
+        
+        return ()
+    
+    def _build_aliases(self):
+        """
+        Build the alias map from the medicine dataset and the alias file
+        
+        Returns:
+            dict: Normalized medicine name to tuple of interaction drug names
+        """
+        explicit = self._read_alias_file()
+        medicines = self.medicine_db.medicines_db
+        if medicines is None or 'name' not in medicines.columns:
+            return explicit
+        
+        def normalized(column):
+            if column not in medicines.columns:
+                return [None] * len(medicines)
+            return [value.lower().strip() if isinstance(value, str) and value.strip() else None
+                    for value in medicines[column].tolist()]
+        
+        names = normalized('name')
+        
+        # Group each medicine with its substitutes (union-find over names)
+        parent = {}
+        
+        def find(name):
+            root = name
+            while parent.setdefault(root, root) != root:
+                root = parent[root]
+            while parent[name] != root:
+                parent[name], name = root, parent[name]
+            return root
+        
+        for row, name in enumerate(names):
+            if name is None:
+                continue
+            root = find(name)
+            for substitute in self.medicine_db.row_list('substitutes', row):
+                substitute = substitute.lower().strip() if isinstance(substitute, str) else ''
+                if substitute:
+                    other = find(substitute)
+                    if other != root:
+                        parent[other] = root
+        
+        direct = {}
+        for name in parent:
+            match = explicit.get(name) or self._match_name(name)
+            if match:
+                direct[name] = match
+        
+        group_matches = {}
+        for name, match in direct.items():
+            group_matches.setdefault(find(name), match)
+        
+        aliases = {}
+        for name in names:
+            if name is None or name in aliases:
+                continue
+            match = direct.get(name) or group_matches.get(find(name))
+            if match:
+                aliases[name] = match
+        
+        # Substitutes that never appear as a medicine name of their own
+        for name, match in direct.items():
+            aliases.setdefault(name, match)
+        aliases.update(explicit)
+        
+        return aliases
+    
+    def _read_alias_file(self):
+        """Read the optional alias file into alias -> generic names"""
+        if not self.alias_path or not os.path.exists(self.alias_path):
+            return {}
+        
+        alias_table = pd.read_csv(self.alias_path)
+        aliases = {}
+        for alias, generic in zip(alias_table['alias'], alias_table['generic']):
+            if isinstance(alias, str) and isinstance(generic, str):
+                key = alias.lower().strip()
+                aliases[key] = aliases.get(key, ()) + (generic.lower().strip(),)
+        return aliases
+    
+    def _sources(self):
+        """Signatures of every file the alias map is derived from"""
+        sources = {}
+        for key, path in [('medicines', self.medicine_db.db_path),
+                          ('interactions', self.interaction_checker.db_path),
+                          ('aliases', self.alias_path)]:
+            sources[key] = source_signature(path) if path and os.path.exists(path) else None
+        return sources
+    
+    def _load_cache(self):
+        """
+        Load the alias map from the cache file if it matches the sources
+        
+        Returns:
+            bool: True if the cache was loaded
+        """
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        
+        try:
+            metadata, arrays = read_snapshot(self.cache_path)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable name alias cache: {e}")
+            return False
+        
+        if metadata.get('version') != self.CACHE_VERSION or metadata.get('sources') != self._sources():
+            return False
+        
+        names = decode_strings(arrays['name_offsets'], arrays['name_pool'])
+        generics = decode_strings(arrays['generic_offsets'], arrays['generic_pool'])
+        bounds = arrays['target_offsets'].tolist()
+        targets = arrays['target_ids'].tolist()
+        
+        self.aliases = {
+            name: tuple(generics[t] for t in targets[bounds[i]:bounds[i + 1]])
+            for i, name in enumerate(names)
+        }
+        return True
+    
+    def _save_cache(self):
+        """Write the alias map to the cache file"""
+        if not self.cache_path or self.medicine_db.medicines_db is None or len(self.medicine_db.medicines_db) == 0:
+            return
+        
+        generic_ids = {}
+        target_ids = []
+        target_offsets = np.zeros(len(self.aliases) + 1, dtype=np.int64)
+        for i, generics in enumerate(self.aliases.values()):
+            target_ids.extend(generic_ids.setdefault(g, len(generic_ids)) for g in generics)
+            target_offsets[i + 1] = len(target_ids)
+        
+        arrays = {'target_offsets': target_offsets, 'target_ids': np.array(target_ids, dtype=np.int32)}
+        arrays['name_offsets'], arrays['name_pool'] = encode_strings(list(self.aliases))
+        arrays['generic_offsets'], arrays['generic_pool'] = encode_strings(list(generic_ids))
+        
+        try:
+            write_snapshot(self.cache_path, arrays,
+                           {'version': self.CACHE_VERSION, 'sources': self._sources()})
+        except OSError as e:
+            print(f"Warning: Could not write name alias cache: {e}")